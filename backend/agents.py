@@ -1,445 +1,419 @@
-from typing import Dict, Any, List
-import ollama
+from typing import Dict, Any, List, Tuple, AsyncIterator, TYPE_CHECKING
+from types import MappingProxyType
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+import asyncio
+import functools
+import hashlib
 import logging
+import re
+import sys
+import threading
+from pydantic import BaseModel
 
 # Import config to check if we're using mock data
 from config import USE_MOCK_DATA, OLLAMA_MODEL, OLLAMA_HOST, OLLAMA_TIMEOUT, AGENT_MODELS, AGENT_TIMEOUTS
+from config import AGENT_MAX_PARALLEL, OLLAMA_SEMAPHORE, OLLAMA_KEEP_ALIVE, ENABLE_AGENT_CACHE, AGENT_CACHE_DIR, AGENT_CACHE_SIZE_LIMIT
+
+# Handlers are configured by the application entry point (config.py / main.py)
+logger = logging.getLogger(__name__)
+
+# CrewAI and ollama are imported on first use so mock mode and plain template
+# access don't pay for loading them
+if TYPE_CHECKING:
+    from crewai import Agent, Task, Crew
 
-# Import crewai only if not using mock data
-if not USE_MOCK_DATA:
+@functools.cache
+def _lazy_crewai():
+    """Import CrewAI on first use"""
     try:
-        from crewai import Agent, Task
+        import crewai
     except ImportError:
-        logging.warning("CrewAI not installed. Only mock mode will work.")
-import json
-import logging
+        logger.warning("CrewAI not installed. Only mock mode will work.")
+        raise
+    return crewai
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+@functools.cache
+def _lazy_ollama():
+    """Import ollama on first use"""
+    import ollama
+    return ollama
+
+# Static agent backstories. Kept byte-identical across calls so the model
+# server can reuse the cached prompt prefix instead of re-encoding it
+_NO_PLACEHOLDERS = sys.intern(" with full implementations, not just placeholders or JSON structures. Never use placeholders like '[...]' in your code.")
+
+ROLE_BACKSTORIES = {
+    "planner": "You are an expert systems architect who breaks down app ideas into clear, achievable plans. You analyze requirements and create detailed specifications. Always provide complete, detailed plans with concrete implementation details, not just placeholders or JSON structures.",
+    "frontend": "You are a skilled frontend developer who creates engaging user interfaces with React and modern CSS. You always provide complete, executable code files" + _NO_PLACEHOLDERS,
+    "backend": "You are an expert backend developer who creates secure, efficient APIs and server-side logic. You always provide complete, executable code files" + _NO_PLACEHOLDERS,
+    "tester": "You are a thorough QA professional who tests applications to find bugs and performance issues before users do. You always provide complete, executable test files" + _NO_PLACEHOLDERS,
+    "deployment": "You are a DevOps engineer who specializes in creating smooth deployment workflows and documentation. You always provide complete, executable configuration files" + _NO_PLACEHOLDERS
+}
+
+# Expected task outputs, frozen so their token IDs stay stable between runs
+EXPECTED_OUTPUTS = {
+    "planner": "A detailed plan with features, architecture, tech stack, and timeline. Provide concrete implementation details, not just placeholders.",
+    "backend": "Complete, executable code files for the backend. Include main.py, models.py, database.py, and any other necessary files with full implementations. Do NOT use placeholders like '[...]' in your code.",
+    "frontend": "Complete, executable React component files. Include App.jsx, component files, and any other necessary files with full implementations. Do NOT use placeholders like '[...]' in your code.",
+    "tester_backend": "Complete, executable test files for the backend. Include actual test implementations, not placeholders like '[...]' in your code.",
+    "tester_frontend": "Complete, executable test files for the frontend. Include actual test implementations, not placeholders like '[...]' in your code.",
+    "deployment": "Complete, executable deployment files including Dockerfile, docker-compose.yml, and any other necessary files with full implementations. Do NOT use placeholders like '[...]' in your code."
+}
+
+class PlannerPlan(BaseModel):
+    """Structured output of the planning task"""
+    features: List[str]
+    architecture: str
+    tech_stack: Dict[str, str]
+    timeline: str
+
+class GeneratedFiles(BaseModel):
+    """Structured output of a code-producing task, file path -> file content"""
+    files: Dict[str, str]
+
+# Pydantic models the tasks decode into, so the LLM output is validated once
+# by CrewAI instead of being re-parsed from free text downstream
+TASK_OUTPUT_MODELS = {
+    "planner": PlannerPlan,
+    "backend": GeneratedFiles,
+    "frontend": GeneratedFiles,
+    "tester_backend": GeneratedFiles,
+    "tester_frontend": GeneratedFiles,
+    "deployment": GeneratedFiles
+}
+
+def cached_system_prompt(role: str, provider: str = "ollama"):
+    """Return a role's backstory in the form the provider can cache"""
+    backstory = ROLE_BACKSTORIES[role]
+    if provider == "anthropic":
+        return {"type": "text", "text": backstory, "cache_control": {"type": "ephemeral"}}
+    # Ollama (llama.cpp) reuses its KV cache whenever the prompt prefix is unchanged
+    return backstory
+
+# Upstream tasks whose output each task consumes. Drives both the CrewAI
+# context chain and the scheduling in AgentSystem.stream
+TASK_DEPENDENCIES = {
+    "planner": (),
+    "backend": ("planner",),
+    "frontend": ("planner", "backend"),
+    "tester_backend": ("backend",),
+    "tester_frontend": ("frontend",),
+    "deployment": ("backend", "frontend", "tester_backend", "tester_frontend"),
+}
+
+# Task definitions in execution order: (name, agent, description, async_execution).
+# Dependencies, expected outputs and output models are looked up by name.
+# Async tasks overlap with the next task in the sequential CrewAI process;
+# CrewAI joins them before any task that takes them as context
+_TASK_SPECS = (
+    ("planner", "planner", "Analyze the following app idea and create a detailed plan for a messaging application: {prompt}\n\nProvide a complete, detailed plan with concrete implementation details. Include specific API endpoints, data models, and component structures. Focus on code architecture and implementation patterns.", False),
+    ("backend", "backend", "Create complete, functional FastAPI backend code for a messaging application based on the planning document. Include all necessary files with full implementations, not just placeholders or JSON structures. Focus on real-time messaging capabilities, user authentication, and data storage.", False),
+    ("frontend", "frontend", "Create complete, functional React components with Tailwind CSS for a messaging application based on the planning document and backend API. Include all necessary files with full implementations, not just placeholders or JSON structures. Focus on the chat interface, message display, and real-time updates.", True),
+    ("tester_backend", "tester", "Write complete, functional tests for the backend code of the messaging application. Include all necessary test files with full implementations, not just placeholders or JSON structures. Focus on testing real-time communication, message delivery, and user authentication.", False),
+    ("tester_frontend", "tester", "Write complete, functional tests for the frontend code of the messaging application. Include all necessary test files with full implementations, not just placeholders or JSON structures. Focus on testing the chat interface, message display, and real-time updates.", False),
+    ("deployment", "deployment", "Create complete deployment configuration for the messaging application. Include all necessary files with full implementations, not just placeholders or JSON structures. Focus on containerization, database setup, and WebSocket configuration for real-time messaging.", False)
+)
+
+# Fast mode fuses the planner, backend and frontend tasks into one LLM call
+# whose response carries each part in a sentinel-delimited section
+_FAST_TASK_DESCRIPTION = "Analyze the following app idea, plan it, and write its backend and frontend in a single response: {prompt}\n\nPut the plan (features, architecture, tech stack, timeline) inside <plan></plan>, the complete FastAPI backend code inside <backend></backend>, and the complete React components with Tailwind CSS inside <frontend></frontend>. Include all necessary files with full implementations, not just placeholders or JSON structures."
+_FAST_EXPECTED_OUTPUT = "Exactly three sections: <plan>...</plan><backend>...</backend><frontend>...</frontend>, each complete. Do NOT use placeholders like '[...]' in your code."
+_SECTION_RE = re.compile(r"<(plan|backend|frontend)>(.*?)</\1>", re.S)
+
+def _split_sections(text: str) -> Dict[str, str]:
+    """Split a fast mode response into its plan, backend and frontend sections"""
+    return {name: body.strip() for name, body in _SECTION_RE.findall(text)}
+
+class _MemoryCache(OrderedDict):
+    """Stand-in for diskcache.Cache that keeps the maxsize most recently used entries"""
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+# Task outputs kept when diskcache isn't installed
+_MEMORY_CACHE_SIZE = 64
+
+# Finished task outputs, persisted on disk when diskcache is available
+try:
+    import diskcache
+    _TASK_CACHE = diskcache.Cache(AGENT_CACHE_DIR, size_limit=AGENT_CACHE_SIZE_LIMIT)
+except ImportError:
+    logger.warning("diskcache not installed. Task results will only be cached in memory.")
+    _TASK_CACHE = _MemoryCache(_MEMORY_CACHE_SIZE)
+
+def _task_cache_key(task: "Task", llm_name: str) -> str:
+    """Hash everything a task's output depends on: LLM, role, description, expected
+    output, output model and context outputs"""
+    output_model = task.output_pydantic
+    model_name = f"{output_model.__module__}.{output_model.__qualname__}" if output_model else ""
+    digest = hashlib.sha256()
+    for part in (llm_name, task.agent.role, task.description, task.expected_output, model_name):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for context_task in task.context or ():
+        digest.update(str(context_task.output.raw_output).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _execute_task(task: "Task", llm_name: str) -> BaseModel:
+    """Execute a task to completion, returning a cached output for identical inputs"""
+    key = _task_cache_key(task, llm_name) if ENABLE_AGENT_CACHE else None
+    if key is not None and key in _TASK_CACHE:
+        logger.info(f"Task cache hit for {task.agent.role}")
+        # Dependent tasks read their context from task.output, so restore it too
+        task.output = _TASK_CACHE[key]
+        return task.output.exported_output
+    
+    output = task.execute()
+    if task.async_execution:
+        task.thread.join()
+        output = task.output.exported_output
+    
+    if key is not None:
+        _TASK_CACHE[key] = task.output
+    return output
+
+# Keep-alive pool shared by every direct Ollama request from this process
+_OLLAMA_POOL_LIMITS = {"max_keepalive_connections": 16, "max_connections": 32, "keepalive_expiry": 30}
+
+@functools.lru_cache(maxsize=None)
+def _ollama_client():
+    """Create the process-wide Ollama client, reusing pooled connections and retrying failed connects"""
+    import httpx
+    transport = httpx.AsyncHTTPTransport(retries=2, limits=httpx.Limits(**_OLLAMA_POOL_LIMITS))
+    # ollama.AsyncClient forwards extra keyword arguments to its httpx.AsyncClient
+    return _lazy_ollama().AsyncClient(host=OLLAMA_HOST, transport=transport)
+
+@functools.lru_cache(maxsize=None)
+def _ollama_session():
+    """Create the process-wide blocking HTTP session for raw Ollama API calls"""
+    import httpx
+    transport = httpx.HTTPTransport(retries=2, limits=httpx.Limits(**_OLLAMA_POOL_LIMITS))
+    return httpx.Client(base_url=OLLAMA_HOST, transport=transport, timeout=OLLAMA_TIMEOUT)
+
+@functools.cache
+def _warmup(model: str):
+    """Load a model with a one-token generation so the first agent call doesn't wait for it"""
+    try:
+        response = _ollama_session().post("/api/generate", json={
+            "model": model,
+            "prompt": "ok",
+            "options": {"num_predict": 1},
+            "keep_alive": OLLAMA_KEEP_ALIVE
+        })
+        response.raise_for_status()
+        logger.info(f"Warmed up Ollama model {model}")
+    except Exception as e:
+        logger.warning(f"Could not warm up Ollama model {model}: {e}")
+
+# LiteLLM settings shared by every agent; only the model and timeout differ.
+# Read-only so nothing downstream can mutate the copy every agent starts from
+_LLM_BASE_CONFIG = MappingProxyType({
+    "context_window": 16384,  # Increased for WizardCoder's larger context window
+    "tool_system": False,    # Disable tool system to avoid compatibility issues
+    "seed": 42               # For consistent results
+})
+
+@dataclass(frozen=True, slots=True)
+class AgentSpec:
+    """Static definition of one CrewAI agent"""
+    key: str
+    role: str
+    goal: str
+    backstory: str
 
 class AgentSystem:
     """Manages the AI agent system for app generation"""
     
+    __slots__ = ("llm_name", "client", "agents")
+    
     def __init__(self, llm_name="wizardcoder"):
         """Initialize the agent system with specified LLM"""
         self.llm_name = llm_name
-        self.agents = self._create_agents()
-        
-    def _create_agents(self) -> Dict[str, Agent]:
-        """Create all required agents for the system"""
-        return {
-            "planner": self._create_planner_agent(),
-            "frontend": self._create_frontend_agent(),
-            "backend": self._create_backend_agent(),
-            "tester": self._create_tester_agent(),
-            "deployment": self._create_deployment_agent()
-        }
-    
-    def _create_planner_agent(self):
-        """Create the planning agent that designs application architecture"""
-        # Use a compatible configuration for Ollama with LiteLLM
-        llm = {
-            "model": f"ollama/{AGENT_MODELS['planner']}",
-            "api_base": OLLAMA_HOST,
-            "config": {
-                "context_window": 16384,  # Increased for WizardCoder's larger context window
-                "tool_system": False,    # Disable tool system to avoid compatibility issues
-                "seed": 42,              # For consistent results
-                "timeout": AGENT_TIMEOUTS["planner"]  # Use planner-specific timeout
-            }
-        }
-        
-        return Agent(
-            role="Planning Architect",
-            goal="Create a detailed plan for the application based on user requirements",
-            backstory="You are an expert systems architect who breaks down app ideas into clear, achievable plans. You analyze requirements and create detailed specifications. Always provide complete, detailed plans with concrete implementation details, not just placeholders or JSON structures.",
-            verbose=True,
-            allow_delegation=False,
-            llm=llm
-        )
+        # Async client so direct LLM calls don't block the event loop
+        self.client = _ollama_client()
+        # Agents are shared between systems using the same LLM
+        self.agents = _build_agents(llm_name)
+        if not USE_MOCK_DATA:
+            # Load the agents' models in the background, off the request path
+            for model in {AGENT_MODELS[key] for key in self._AGENT_SPECS}:
+                threading.Thread(target=_warmup, args=(model,), daemon=True).start()
     
-    def _create_frontend_agent(self):
-        """Create the frontend developer agent"""
-        # Use a compatible configuration for Ollama with LiteLLM
-        llm = {
-            "model": f"ollama/{AGENT_MODELS['frontend']}",
-            "api_base": OLLAMA_HOST,
-            "config": {
-                "context_window": 16384,  # Increased for WizardCoder's larger context window
-                "tool_system": False,    # Disable tool system to avoid compatibility issues
-                "seed": 42,              # For consistent results
-                "timeout": AGENT_TIMEOUTS["frontend"]  # Use frontend-specific timeout
-            }
-        }
-        
-        return Agent(
-            role="Frontend Developer",
-            goal="Create beautiful, responsive, and user-friendly frontend code",
-            backstory="You are a skilled frontend developer who creates engaging user interfaces with React and modern CSS. You always provide complete, executable code files with full implementations, not just placeholders or JSON structures. Never use placeholders like '[...]' in your code.",
-            verbose=True,
-            allow_delegation=False,
-            llm=llm
-        )
+    async def chat(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Send a chat request to Ollama without blocking the event loop"""
+        async with OLLAMA_SEMAPHORE:
+            return await self.client.chat(model=self.llm_name, messages=messages)
     
-    def _create_backend_agent(self):
-        """Create the backend developer agent"""
-        # Use a compatible configuration for Ollama with LiteLLM
-        llm = {
-            "model": f"ollama/{AGENT_MODELS['backend']}",
-            "api_base": OLLAMA_HOST,
-            "config": {
-                "context_window": 16384,  # Increased for WizardCoder's larger context window
-                "tool_system": False,    # Disable tool system to avoid compatibility issues
-                "seed": 42,              # For consistent results
-                "timeout": AGENT_TIMEOUTS["backend"]  # Use backend-specific timeout
-            }
-        }
+    async def plan(self, prompt: str) -> str:
+        """Draft a plan with a single direct chat call, as the planner"""
+        response = await self.chat([
+            {"role": "system", "content": cached_system_prompt("planner")},
+            {"role": "user", "content": prompt}
+        ])
+        return response["message"]["content"]
         
-        return Agent(
-            role="Backend Engineer",
-            goal="Create robust, scalable backend systems",
-            backstory="You are an expert backend developer who creates secure, efficient APIs and server-side logic. You always provide complete, executable code files with full implementations, not just placeholders or JSON structures. Never use placeholders like '[...]' in your code.",
-            verbose=True,
-            allow_delegation=False,
-            llm=llm
-        )
+    # Agent definitions by key
+    _AGENT_SPECS = {spec.key: spec for spec in (
+        AgentSpec("planner", "Planning Architect", "Create a detailed plan for the application based on user requirements", ROLE_BACKSTORIES["planner"]),
+        AgentSpec("frontend", "Frontend Developer", "Create beautiful, responsive, and user-friendly frontend code", ROLE_BACKSTORIES["frontend"]),
+        AgentSpec("backend", "Backend Engineer", "Create robust, scalable backend systems", ROLE_BACKSTORIES["backend"]),
+        AgentSpec("tester", "Quality Assurance Engineer", "Ensure code quality and identify potential issues", ROLE_BACKSTORIES["tester"]),
+        AgentSpec("deployment", "DevOps Engineer", "Create deployment instructions and configuration for easy application deployment", ROLE_BACKSTORIES["deployment"])
+    )}
     
-    def _create_tester_agent(self):
-        """Create the QA tester agent"""
-        # Use a compatible configuration for Ollama with LiteLLM
-        llm = {
-            "model": f"ollama/{AGENT_MODELS['tester']}",
+    @staticmethod
+    def _build_llm(key: str) -> Dict[str, Any]:
+        """Build the LiteLLM configuration for an agent's model and timeout"""
+        return {
+            "model": f"ollama/{AGENT_MODELS[key]}",
             "api_base": OLLAMA_HOST,
-            "config": {
-                "context_window": 16384,  # Increased for WizardCoder's larger context window
-                "tool_system": False,    # Disable tool system to avoid compatibility issues
-                "seed": 42,              # For consistent results
-                "timeout": AGENT_TIMEOUTS["tester"]  # Use tester-specific timeout
-            }
+            "config": {**_LLM_BASE_CONFIG, "timeout": AGENT_TIMEOUTS[key]}
         }
-        
-        return Agent(
-            role="Quality Assurance Engineer",
-            goal="Ensure code quality and identify potential issues",
-            backstory="You are a thorough QA professional who tests applications to find bugs and performance issues before users do. You always provide complete, executable test files with full implementations, not just placeholders or JSON structures. Never use placeholders like '[...]' in your code.",
-            verbose=True,
-            allow_delegation=False,
-            llm=llm
-        )
     
-    def _create_deployment_agent(self):
-        """Create the deployment specialist agent"""
-        # Use a compatible configuration for Ollama with LiteLLM
-        llm = {
-            "model": f"ollama/{AGENT_MODELS['deployment']}",
-            "api_base": OLLAMA_HOST,
-            "config": {
-                "context_window": 16384,  # Increased for WizardCoder's larger context window
-                "tool_system": False,    # Disable tool system to avoid compatibility issues
-                "seed": 42,              # For consistent results
-                "timeout": AGENT_TIMEOUTS["deployment"]  # Use deployment-specific timeout
-            }
-        }
-        
-        return Agent(
-            role="DevOps Engineer",
-            goal="Create deployment instructions and configuration for easy application deployment",
-            backstory="You are a DevOps engineer who specializes in creating smooth deployment workflows and documentation. You always provide complete, executable configuration files with full implementations, not just placeholders or JSON structures. Never use placeholders like '[...]' in your code.",
+    @classmethod
+    def _create_agent(cls, key: str) -> "Agent":
+        """Create the agent described by _AGENT_SPECS[key]"""
+        spec = cls._AGENT_SPECS[key]
+        return _lazy_crewai().Agent(
+            role=spec.role,
+            goal=spec.goal,
+            backstory=spec.backstory,
             verbose=True,
             allow_delegation=False,
-            llm=llm
+            llm=cls._build_llm(key)
         )
     
-    def create_tasks(self, prompt: str) -> Dict[str, Task]:
+    def create_tasks(self, prompt: str) -> Dict[str, "Task"]:
         """Create tasks for all agents based on the user prompt"""
+        Task = _lazy_crewai().Task
         tasks = {}
         
-        # Planner task
-        tasks["planner"] = Task(
-            description=f"Analyze the following app idea and create a detailed plan for a messaging application: {prompt}\n\nProvide a complete, detailed plan with concrete implementation details. Include specific API endpoints, data models, and component structures. Focus on code architecture and implementation patterns.",
-            expected_output="A detailed plan with features, architecture, tech stack, and timeline. Provide concrete implementation details, not just placeholders.",
-            agent=self.agents["planner"]
-        )
-        
-        # Backend task
-        tasks["backend"] = Task(
-            description="Create complete, functional FastAPI backend code for a messaging application based on the planning document. Include all necessary files with full implementations, not just placeholders or JSON structures. Focus on real-time messaging capabilities, user authentication, and data storage.",
-            expected_output="Complete, executable code files for the backend. Include main.py, models.py, database.py, and any other necessary files with full implementations. Do NOT use placeholders like '[...]' in your code.",
-            agent=self.agents["backend"],
-            context=[tasks["planner"]]
-        )
+        for name, _, description, async_execution in _TASK_SPECS:
+            tasks[name] = Task(
+                description=description.format(prompt=prompt),
+                expected_output=EXPECTED_OUTPUTS[name],
+                output_pydantic=TASK_OUTPUT_MODELS[name],
+                agent=self.agents[name],
+                context=tuple(tasks[dep] for dep in TASK_DEPENDENCIES[name]),
+                async_execution=async_execution
+            )
         
-        # Frontend task
-        tasks["frontend"] = Task(
-            description="Create complete, functional React components with Tailwind CSS for a messaging application based on the planning document and backend API. Include all necessary files with full implementations, not just placeholders or JSON structures. Focus on the chat interface, message display, and real-time updates.",
-            expected_output="Complete, executable React component files. Include App.jsx, component files, and any other necessary files with full implementations. Do NOT use placeholders like '[...]' in your code.",
-            agent=self.agents["frontend"],
-            context=[tasks["planner"], tasks["backend"]]
+        return tasks
+    
+    def create_tasks_fast(self, prompt: str) -> "Task":
+        """Create the single fused planner/backend/frontend task used in fast mode"""
+        return _lazy_crewai().Task(
+            description=_FAST_TASK_DESCRIPTION.format(prompt=prompt),
+            expected_output=_FAST_EXPECTED_OUTPUT,
+            agent=self.agents["planner"]
         )
-        
-        # Testing task
-        tasks["tester"] = Task(
-            description="Write complete, functional tests for the backend and frontend code of the messaging application. Include all necessary test files with full implementations, not just placeholders or JSON structures. Focus on testing real-time communication, message delivery, and user authentication.",
-            expected_output="Complete, executable test files for both backend and frontend. Include actual test implementations, not placeholders like '[...]' in your code.",
-            agent=self.agents["tester"],
-            context=[tasks["backend"], tasks["frontend"]]
+    
+    def create_crew(self, prompt: str) -> "Crew":
+        """Create a sequential crew; tasks marked async_execution still run concurrently"""
+        crewai = _lazy_crewai()
+        tasks = self.create_tasks(prompt)
+        return crewai.Crew(
+            agents=list(self.agents.values()),
+            tasks=list(tasks.values()),
+            process=crewai.Process.sequential,
+            verbose=True
         )
+    
+    async def stream(self, prompt: str) -> AsyncIterator[Tuple[str, BaseModel]]:
+        """Yield (task name, output) as tasks finish, starting each as soon as its dependencies are done"""
+        tasks = self.create_tasks(prompt)
+        # All agents share one Ollama server, so cap how many tasks hit it at once
+        limit = asyncio.Semaphore(AGENT_MAX_PARALLEL)
         
-        # Deployment task
-        tasks["deployment"] = Task(
-            description="Create complete deployment configuration for the messaging application. Include all necessary files with full implementations, not just placeholders or JSON structures. Focus on containerization, database setup, and WebSocket configuration for real-time messaging.",
-            expected_output="Complete, executable deployment files including Dockerfile, docker-compose.yml, and any other necessary files with full implementations. Do NOT use placeholders like '[...]' in your code.",
-            agent=self.agents["deployment"],
-            context=[tasks["backend"], tasks["frontend"], tasks["tester"]]
-        )
+        async def run_task(name: str) -> BaseModel:
+            async with limit, OLLAMA_SEMAPHORE:
+                # Task.execute is blocking, so run it in its own thread
+                return await asyncio.to_thread(_execute_task, tasks[name], self.llm_name)
         
-        return tasks
+        finished = set()
+        waiting = dict(TASK_DEPENDENCIES)
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while waiting or running:
+                ready = [name for name, deps in waiting.items() if finished.issuperset(deps)]
+                for name in ready:
+                    del waiting[name]
+                    logger.info(f"Starting task: {name}")
+                    running[asyncio.create_task(run_task(name))] = name
+                if not running:
+                    raise ValueError(f"Circular task dependencies between: {list(waiting)}")
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    finished.add(name)
+                    yield name, future.result()
+        finally:
+            # The consumer stopped early or a task failed; don't leave siblings running
+            for future in running:
+                future.cancel()
+    
+    async def kickoff(self, prompt: str) -> Dict[str, BaseModel]:
+        """Run all tasks for a prompt and collect their outputs"""
+        return {name: output async for name, output in self.stream(prompt)}
+    
+    async def kickoff_fast(self, prompt: str) -> Dict[str, str]:
+        """Plan and write a simple app in one LLM call, returning its plan/backend/frontend sections"""
+        async with OLLAMA_SEMAPHORE:
+            output = await asyncio.to_thread(_execute_task, self.create_tasks_fast(prompt), self.llm_name)
+        return _split_sections(str(output))
+
+@functools.lru_cache(maxsize=4)
+def _build_agents(llm_name: str) -> MappingProxyType:
+    """
+    Create one agent per task once per LLM; read-only since instances are shared.
+    Tasks with the same role (the backend and frontend tests, which run in
+    parallel) get separate instances so they don't share an agent's state.
+    """
+    return MappingProxyType({name: AgentSystem._create_agent(agent) for name, agent, *_ in _TASK_SPECS})
+
+@functools.lru_cache(maxsize=4)
+def get_agent_system(llm_name: str = "wizardcoder") -> AgentSystem:
+    """Return the process-wide AgentSystem for an LLM; it holds no per-request state"""
+    return AgentSystem(llm_name)
+
+# Template files are read once at import; backend_main is pre-parsed for substitution
+_TEMPLATES_DIR = Path(__file__).parent / "templates"
+_REACT_APP = (_TEMPLATES_DIR / "react_app.jsx").read_text(encoding="utf-8")
+_REACT_HOME = (_TEMPLATES_DIR / "react_home.jsx").read_text(encoding="utf-8")
+_BACKEND_MAIN = Template((_TEMPLATES_DIR / "backend_main.py.tmpl").read_text(encoding="utf-8"))
 
 # Template responses for code generation (used when LLM isn't available)
 class CodeTemplates:
     """Provides template code for different parts of the application"""
     
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def backend_main(app_name: str) -> str:
         """Generate main FastAPI file"""
-        return f"""from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
-import uvicorn
-
-app = FastAPI(title="{app_name} API", version="1.0.0")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-class Item(BaseModel):
-    id: Optional[int] = None
-    title: str
-    description: str
-
-# Sample data
-items = [
-    {{"id": 1, "title": "Sample Item 1", "description": "This is a sample item"}},
-    {{"id": 2, "title": "Sample Item 2", "description": "Another sample item"}},
-]
-
-@app.get("/")
-async def root():
-    return {{"message": "Welcome to {app_name} API"}}
-
-@app.get("/api/data")
-async def get_data():
-    return items
-
-@app.post("/api/data")
-async def create_item(item: Item):
-    item.id = len(items) + 1
-    items.append(item.dict())
-    return item
-
-@app.get("/api/data/{{item_id}}")
-async def get_item(item_id: int):
-    for item in items:
-        if item["id"] == item_id:
-            return item
-    raise HTTPException(status_code=404, detail="Item not found")
-
-if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
-"""
+        return _BACKEND_MAIN.substitute(app_name=app_name)
 
     @staticmethod
     def react_app_component() -> str:
         """Generate React App component"""
-        return """import React from 'react';
-import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
-import HomePage from './components/HomePage';
-import './App.css';
-
-function App() {
-  return (
-    <Router>
-      <div className="min-h-screen bg-gradient-to-br from-gray-900 to-blue-900">
-        <Routes>
-          <Route path="/" element={<HomePage />} />
-        </Routes>
-      </div>
-    </Router>
-  );
-}
-
-export default App;"""
+        return _REACT_APP
 
     @staticmethod
     def react_home_component() -> str:
         """Generate React Home component"""
-        return """import React, { useState, useEffect } from 'react';
-import { motion } from 'framer-motion';
-
-const HomePage = () => {
-  const [prompt, setPrompt] = useState('');
-  const [isProcessing, setIsProcessing] = useState(false);
-  const [logs, setLogs] = useState([]);
-  const [results, setResults] = useState(null);
-  const [activeTab, setActiveTab] = useState('frontend');
-
-  const handleSubmit = async (e) => {
-    e.preventDefault();
-    if (!prompt.trim()) return;
-    
-    setIsProcessing(true);
-    setLogs([]);
-    setResults(null);
-    
-    try {
-      // Start the job
-      const response = await fetch('/api/generate', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ prompt })
-      });
-      
-      const data = await response.json();
-      const jobId = data.job_id;
-      
-      // Connect to WebSocket for real-time logs
-      const ws = new WebSocket(`ws://localhost:8000/ws/${jobId}`);
-      
-      ws.onmessage = (event) => {
-        const logData = JSON.parse(event.data);
-        setLogs(prevLogs => [...prevLogs, logData]);
-      };
-      
-      // Poll for job completion
-      const checkInterval = setInterval(async () => {
-        const statusRes = await fetch(`/api/jobs/${jobId}`);
-        const statusData = await statusRes.json();
-        
-        if (statusData.status === 'completed') {
-          clearInterval(checkInterval);
-          setResults(statusData.results);
-          setIsProcessing(false);
-          ws.close();
-        } else if (statusData.status === 'failed') {
-          clearInterval(checkInterval);
-          setIsProcessing(false);
-          ws.close();
-          alert('Job failed: ' + statusData.error);
-        }
-      }, 2000);
-      
-    } catch (error) {
-      console.error('Error:', error);
-      setIsProcessing(false);
-    }
-  };
-
-  return (
-    <div className="container mx-auto px-4 py-8">
-      <motion.div 
-        initial={{ opacity: 0, y: -20 }}
-        animate={{ opacity: 1, y: 0 }}
-        className="text-center mb-8"
-      >
-        <h1 className="text-5xl font-bold text-white mb-4">
-          🤖 AI Agent App Builder
-        </h1>
-        <p className="text-xl text-gray-300">
-          Transform your ideas into production-ready apps with AI agents
-        </p>
-      </motion.div>
-      
-      {/* Form section */}
-      <motion.div 
-        initial={{ opacity: 0, scale: 0.95 }}
-        animate={{ opacity: 1, scale: 1 }}
-        className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 mb-8 border border-white border-opacity-20"
-      >
-        <form onSubmit={handleSubmit} className="space-y-4">
-          <div>
-            <label className="block text-white text-lg font-semibold mb-2">
-              Describe your app idea:
-            </label>
-            <textarea
-              value={prompt}
-              onChange={(e) => setPrompt(e.target.value)}
-              placeholder="e.g., I want a movie recommendation app using TMDB API with user ratings and favorites..."
-              className="w-full h-32 p-4 bg-white bg-opacity-10 border border-white border-opacity-20 rounded-xl text-white placeholder-gray-300 focus:outline-none focus:ring-2 focus:ring-blue-400"
-              disabled={isProcessing}
-            />
-          </div>
-          <motion.button
-            whileHover={{ scale: 1.05 }}
-            whileTap={{ scale: 0.95 }}
-            type="submit"
-            disabled={isProcessing || !prompt.trim()}
-            className="w-full bg-gradient-to-r from-blue-500 to-purple-600 text-white font-bold py-4 px-8 rounded-xl disabled:opacity-50 disabled:cursor-not-allowed hover:shadow-lg transition-all duration-300"
-          >
-            {isProcessing ? (
-              <span className="flex items-center justify-center">
-                <div className="animate-spin rounded-full h-6 w-6 border-b-2 border-white mr-3"></div>
-                Agents Working...
-              </span>
-            ) : (
-              '🚀 Launch AI Agents'
-            )}
-          </motion.button>
-        </form>
-      </motion.div>
-      
-      {/* Results section - only shown when results are available */}
-      {(isProcessing || results) && (
-        <div className="grid lg:grid-cols-3 gap-8 mt-8">
-          {/* Agent Status Panel */}
-          <div className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 border border-white border-opacity-20">
-            <h2 className="text-2xl font-bold text-white mb-6 flex items-center">
-              <span className="mr-3">🔄</span>
-              Agent Pipeline
-            </h2>
-            {/* Agent status items would go here */}
-          </div>
-          
-          {/* Agent Logs */}
-          <div className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 border border-white border-opacity-20">
-            <h2 className="text-2xl font-bold text-white mb-6 flex items-center">
-              <span className="mr-3">📊</span>
-              Agent Console
-            </h2>
-            <div className="bg-black bg-opacity-50 rounded-lg p-4 h-80 overflow-y-auto font-mono">
-              {logs.length === 0 ? (
-                <div className="text-gray-400 text-center py-8">
-                  Agent logs will appear here...
-                </div>
-              ) : (
-                logs.map((log, index) => (
-                  <div key={index} className="mb-2 text-sm">
-                    <span className="text-gray-500">[{log.timestamp}]</span>
-                    <span className={`${log.status === 'completed' ? 'text-green-400' : 'text-blue-400'}`}> {log.message}</span>
-                  </div>
-                ))
-              )}
-            </div>
-          </div>
-          
-          {/* Code Preview Panel */}
-          <div className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 border border-white border-opacity-20">
-            <h2 className="text-2xl font-bold text-white mb-6 flex items-center">
-              <span className="mr-3">💻</span>
-              Code Preview
-            </h2>
-            {/* Code preview tabs and content would go here */}
-          </div>
-        </div>
-      )}
-    </div>
-  );
-};
-
-export default HomePage;"""
+        return _REACT_HOME
@@ -2,8 +2,344 @@ import subprocess
 import os
 import json
 import re
+import atexit
+import functools
+import hashlib
+import io
+import itertools
+import logging
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from html.parser import HTMLParser
 from typing import Dict, List, Any, Tuple, Optional
 
+from config import ENABLE_PYLINT
+
+logger = logging.getLogger(__name__)
+
+# pylint is optional and only loaded when ENABLE_PYLINT is set, once per process
+_pylint_run = None
+if ENABLE_PYLINT:
+    try:
+        from pylint.lint import Run as _pylint_run
+        from pylint.reporters.text import TextReporter
+    except ImportError:
+        logger.warning("pylint not installed. Python files will only be syntax-checked.")
+
+_BRACE_RE = re.compile(r'[{}]')
+# Top-level import/export statements mark a source as an ES module
+_ESM_RE = re.compile(r'^\s*(?:import\b(?!\s*\()|export\b)', re.MULTILINE)
+_VOID_TAGS = frozenset({
+    'meta', 'link', 'input', 'img', 'br', 'hr',
+    'area', 'base', 'col', 'embed', 'source', 'track', 'wbr',
+})
+
+class _TagBalanceParser(HTMLParser):
+    """
+    Tracks open tags while the stdlib tokenizer walks the document, so comments,
+    <script>/<style> bodies and quoted '>' in attributes aren't mistaken for tags.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.open_tags: List[str] = []
+        self.errors: List[str] = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag not in _VOID_TAGS:
+            self.open_tags.append(tag)
+    
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags, no need to track
+        pass
+    
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        open_tags = self.open_tags
+        if not open_tags:
+            self.errors.append(f"Found closing tag </'{tag}'> without matching opening tag")
+        elif open_tags[-1] != tag:
+            self.errors.append(f"Expected closing tag </'{open_tags[-1]}'> but found </'{tag}'>")
+            open_tags.pop()
+        else:
+            open_tags.pop()
+
+
+_CLOSERS = {')': '(', ']': '[', '}': '{'}
+# Closing or self-closing tags; JSX text can hold unpaired brackets like "Hi :)"
+_JSX_TAG_RE = re.compile(r'</[A-Za-z>]|/>')
+
+
+def _quick_balanced(code: str) -> bool:
+    """
+    Cheap bracket check run before handing JavaScript to Node.
+    Only returns False when the code is certainly unbalanced; anything it can't
+    read with confidence (regex literals, JSX markup) passes.
+    """
+    if _JSX_TAG_RE.search(code):
+        return True
+    stack = []
+    i, n = 0, len(code)
+    while i < n:
+        c = code[i]
+        if stack and stack[-1] == '`':
+            # Inside a template literal only the closing backtick and ${ matter
+            if c == '\\':
+                i += 1
+            elif c == '`':
+                stack.pop()
+            elif c == '$' and code.startswith('{', i + 1):
+                stack.append('{')
+                i += 1
+        elif c in '([{':
+            stack.append(c)
+        elif c in ')]}':
+            if not stack or stack.pop() != _CLOSERS[c]:
+                return False
+        elif c == '`':
+            stack.append(c)
+        elif c in '\'"':
+            j = i + 1
+            while j < n and code[j] != c and code[j] != '\n':
+                j += 2 if code[j] == '\\' else 1
+            if j >= n or code[j] != c:
+                return True
+            i = j
+        elif c == '/':
+            nxt = code[i + 1:i + 2]
+            if nxt == '/' and code[i - 1:i] != ':':
+                i = code.find('\n', i)
+                if i < 0:
+                    break
+            elif nxt == '*':
+                i = code.find('*/', i + 2)
+                if i < 0:
+                    return True
+                i += 1
+            elif nxt != '>' and code[i - 1:i] != '<':
+                # Division or a regex literal; only a real parser can tell
+                return True
+        i += 1
+    return not stack
+
+
+# Projects with fewer files than this are validated inline; the work happens in
+# subprocesses and the lint daemon, so threads are enough to overlap it
+_PARALLEL_THRESHOLD = 4
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# pylint keeps global state, so in-process runs must not overlap
+_PYLINT_LOCK = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the shared validation thread pool on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="validator")
+        return _executor
+
+class _ValidationCache:
+    """
+    LRU cache of validation results keyed by file extension, available tools and
+    content hash, persisted to disk at exit so unchanged files skip re-validation
+    across runs. The file is dropped when it was written by a different version.
+    """
+    
+    def __init__(self, path: str, version: str, maxsize: int = 4096):
+        self._path = path
+        self._version = version
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[bool, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(ext: str, tools: str, content: str) -> str:
+        return f"{ext}:{tools}:{hashlib.sha1(content.encode('utf-8')).hexdigest()}"
+    
+    def get(self, key: str) -> Optional[Tuple[bool, List[str]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        # Copy so callers can't mutate the cached error list
+        return entry[0], list(entry[1])
+    
+    def put(self, key: str, result: Tuple[bool, List[str]]):
+        with self._lock:
+            self._entries[key] = (result[0], list(result[1]))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+    
+    def load(self):
+        try:
+            with open(self._path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        try:
+            if stored.get("version") != self._version:
+                return
+            entries = [(key, (bool(success), [str(error) for error in errors]))
+                       for key, (success, errors) in stored["entries"].items()]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed validation cache {self._path}")
+            return
+        with self._lock:
+            self._entries.update(entries)
+    
+    def save(self):
+        with self._lock:
+            entries = dict(self._entries)
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(self._path, "w") as f:
+                json.dump({"version": self._version, "entries": entries}, f)
+        except OSError as e:
+            logger.warning(f"Could not save validation cache: {e}")
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _validator_version() -> str:
+    """Hash of the validator and its Node helpers, so cached results die with them"""
+    digest = hashlib.sha1()
+    for name in ("code_validator.py", "js_lint_daemon.js", "js_syntax_daemon.js"):
+        try:
+            with open(os.path.join(_BACKEND_DIR, name), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(name.encode("utf-8"))
+    return digest.hexdigest()
+
+_validation_cache = _ValidationCache(
+    os.path.join(os.path.expanduser("~"), ".cache", "ai-agents", "validation.json"),
+    _validator_version()
+)
+_validation_cache.load()
+atexit.register(_validation_cache.save)
+
+@functools.cache
+def _have_node() -> bool:
+    """Whether node is on PATH; looked up once so files aren't each failing to spawn it"""
+    return shutil.which("node") is not None
+
+class _NodeDaemonClient:
+    """
+    Client for a long-lived Node helper process (see js_lint_daemon.js).
+    Requests are newline-delimited JSON over the daemon's stdin/stdout, matched by id.
+    Subclasses set _SCRIPT and their own _instance/_instance_lock/_unavailable.
+    """
+    
+    _SCRIPT = ""
+    _NODE_FLAGS: Tuple[str, ...] = ()
+    # Seconds the daemon gets to report ready before it is given up on
+    _STARTUP_TIMEOUT = 10
+    _instance: Optional["_NodeDaemonClient"] = None
+    _instance_lock = threading.Lock()
+    _unavailable = False
+    
+    @classmethod
+    def get(cls):
+        """Return the shared client, starting the daemon on first use; None if it can't run"""
+        with cls._instance_lock:
+            if cls._unavailable:
+                return None
+            if cls._instance is None or cls._instance._process.poll() is not None:
+                try:
+                    cls._instance = cls()
+                except (OSError, RuntimeError, ValueError) as e:
+                    logger.warning(f"{os.path.basename(cls._SCRIPT)} unavailable: {e}")
+                    cls._unavailable = True
+                    return None
+            return cls._instance
+    
+    def __init__(self):
+        self._process = subprocess.Popen(
+            ["node", *self._NODE_FLAGS, self._SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        # Read the handshake on another thread so a daemon that hangs at startup
+        # can't block every validator waiting on _instance_lock
+        first_line = Future()
+        threading.Thread(target=lambda: first_line.set_result(self._process.stdout.readline()), daemon=True).start()
+        try:
+            handshake = json.loads(first_line.result(self._STARTUP_TIMEOUT) or "{}")
+        except FutureTimeoutError:
+            self._process.kill()
+            raise RuntimeError(f"no ready handshake within {self._STARTUP_TIMEOUT}s")
+        if not handshake.get("ready"):
+            self._process.kill()
+            raise RuntimeError(handshake.get("error", "daemon exited during startup"))
+        
+        self._ids = itertools.count()
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._read_responses, daemon=True).start()
+    
+    def request(self, code: str, timeout: float = 5) -> List[str]:
+        """Send source to the daemon, returning its error messages"""
+        future = Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            self._process.stdin.write(json.dumps({"id": request_id, "code": code}) + "\n")
+            self._process.stdin.flush()
+        try:
+            return future.result(timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+    
+    def _read_responses(self):
+        for line in self._process.stdout:
+            response = json.loads(line)
+            with self._lock:
+                future = self._pending.pop(response["id"], None)
+            if future is not None:
+                future.set_result(response["errors"])
+        # The daemon exited; fail anything still waiting on it
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(f"{os.path.basename(self._SCRIPT)} exited"))
+
+class JsLintClient(_NodeDaemonClient):
+    """ESLint worker pool (js_lint_daemon.js), so ESLint is loaded once per process"""
+    
+    _SCRIPT = os.path.join(_BACKEND_DIR, "js_lint_daemon.js")
+    _instance = None
+    _instance_lock = threading.Lock()
+    _unavailable = False
+    
+    def lint(self, code: str, timeout: float = 5) -> List[str]:
+        """Lint JavaScript/JSX source, returning ESLint error messages"""
+        return self.request(code, timeout)
+
+class JsSyntaxClient(_NodeDaemonClient):
+    """Syntax checker (js_syntax_daemon.js) standing in for a `node --check` per file"""
+    
+    _SCRIPT = os.path.join(_BACKEND_DIR, "js_syntax_daemon.js")
+    # vm.SourceTextModule (used to parse ES modules) is behind this flag
+    _NODE_FLAGS = ("--experimental-vm-modules",)
+    _instance = None
+    _instance_lock = threading.Lock()
+    _unavailable = False
+    
+    def check(self, code: str, timeout: float = 5) -> List[str]:
+        """Compile JavaScript without running it, returning syntax errors"""
+        return self.request(code, timeout)
+
 class CodeValidator:
     """
     A utility class for validating generated code across different languages.
@@ -16,98 +352,94 @@ class CodeValidator:
         Validate JavaScript code using ESLint.
         Returns (success, [error_messages])
         """
+        if not _quick_balanced(code):
+            return False, ["Unbalanced brackets, parentheses or braces"]
+        if not _have_node():
+            return False, ["Validation error: Node.js is not installed"]
+        
         try:
-            # Write code to temporary file
-            temp_file = "_temp_validation.js"
-            with open(temp_file, "w") as f:
-                f.write(code)
-            
-            # Run ESLint if available (non-blocking, just reports)
-            try:
-                result = subprocess.run(
-                    ["npx", "eslint", "--no-eslintrc", "--parser-options", "ecmaVersion:latest", temp_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if result.returncode != 0:
-                    return False, [line for line in result.stderr.split("\n") if line.strip()]
-            except Exception as e:
-                # If ESLint fails, fall back to basic JS validation
-                pass
+            # Run ESLint through the shared daemon if available (non-blocking, just reports)
+            lint_client = JsLintClient.get()
+            if lint_client is not None:
+                try:
+                    lint_errors = lint_client.lint(code)
+                    if lint_errors:
+                        return False, lint_errors
+                except Exception:
+                    # If ESLint fails, fall back to basic JS validation
+                    pass
                 
-            # Use Node.js to check for syntax errors
-            result = subprocess.run(
-                ["node", "--check", temp_file],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            # Check syntax in the shared Node process, falling back to a one-off node --check
+            syntax_client = JsSyntaxClient.get()
+            if syntax_client is not None:
+                errors = syntax_client.check(code)
+                return not errors, errors
             
-            # Clean up
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            # Use Node.js to check for syntax errors, piping the code over stdin.
+            # stdin is parsed as CommonJS unless told otherwise, so flag ES modules.
+            # Output stays bytes and is only decoded when there are errors
+            input_type = "--input-type=module" if _ESM_RE.search(code) else "--input-type=commonjs"
+            process = subprocess.Popen(
+                ["node", "--check", input_type, "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+            try:
+                _, stderr = process.communicate(code.encode(), timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
                 
-            if result.returncode != 0:
+            if process.returncode != 0:
                 # Extract error messages
-                errors = [line for line in result.stderr.split("\n") if line.strip()]
+                errors = [line for line in stderr.decode(errors="replace").split("\n") if line.strip()]
                 return False, errors
             
             return True, []
             
         except Exception as e:
             return False, [f"Validation error: {str(e)}"]
-        finally:
-            # Ensure cleanup
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
 
     @staticmethod
     def validate_python(code: str) -> Tuple[bool, List[str]]:
         """
-        Validate Python code using the built-in compile function and pylint if available.
+        Validate Python code using the built-in compile function and, when enabled, pylint.
         Returns (success, [error_messages])
         """
+        # First, compile the code to check for syntax errors
         try:
-            # First, compile the code to check for syntax errors
-            try:
-                compile(code, '<string>', 'exec')
-            except SyntaxError as e:
-                line_no = e.lineno if hasattr(e, 'lineno') else '?'
-                return False, [f"Syntax error at line {line_no}: {str(e)}"]
-            
-            # Write code to temporary file for additional checks
-            temp_file = "_temp_validation.py"
-            with open(temp_file, "w") as f:
-                f.write(code)
+            compile(code, '<string>', 'exec')
+        except SyntaxError as e:
+            line_no = e.lineno if hasattr(e, 'lineno') else '?'
+            return False, [f"Syntax error at line {line_no}: {str(e)}"]
+        except Exception as e:
+            return False, [f"Validation error: {str(e)}"]
+        
+        # pylint is opt-in; compile() already catches syntax errors
+        if _pylint_run is None:
+            return True, []
+        
+        # Write code to a per-call temporary file for pylint
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as tf:
+            tf.write(code)
+            temp_file = tf.name
+        try:
+            # In-process run with the already imported pylint
+            output = io.StringIO()
+            with _PYLINT_LOCK:
+                run = _pylint_run([temp_file, "--errors-only"], reporter=TextReporter(output), exit=False)
+            if run.linter.msg_status != 0:
+                return False, [line for line in output.getvalue().split("\n") if line.strip()]
             
-            # Run pylint if available (non-blocking)
-            try:
-                result = subprocess.run(
-                    ["python", "-m", "pylint", temp_file, "--errors-only"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode != 0:
-                    return False, [line for line in result.stderr.split("\n") + result.stdout.split("\n") if line.strip()]
-            except Exception:
-                # Pylint might not be installed, continue without it
-                pass
-                
-            # Clean up
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-                
             return True, []
             
         except Exception as e:
             return False, [f"Validation error: {str(e)}"]
         finally:
             # Ensure cleanup
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            os.remove(temp_file)
 
     @staticmethod
     def validate_html(code: str) -> Tuple[bool, List[str]]:
@@ -115,31 +447,13 @@ class CodeValidator:
         Basic HTML validation - checks for unclosed tags and syntax issues.
         Returns (success, [error_messages])
         """
-        # Simple tag matching
-        errors = []
-        open_tags = []
-        tag_pattern = re.compile(r'<(/?)(\w+).*?(/?)>')
-        
-        for match in tag_pattern.finditer(code):
-            is_closing, tag_name, is_self_closing = match.groups()
-            
-            if is_self_closing or tag_name in ['meta', 'link', 'input', 'img', 'br', 'hr']:
-                # Self-closing tags, no need to track
-                continue
-                
-            if is_closing:  # Closing tag
-                if not open_tags:
-                    errors.append(f"Found closing tag </'{tag_name}'> without matching opening tag")
-                elif open_tags[-1] != tag_name:
-                    errors.append(f"Expected closing tag </'{open_tags[-1]}'> but found </'{tag_name}'>")
-                    open_tags.pop()
-                else:
-                    open_tags.pop()
-            else:  # Opening tag
-                open_tags.append(tag_name)
+        parser = _TagBalanceParser()
+        parser.feed(code)
+        parser.close()
+        errors = parser.errors
         
         # Check for unclosed tags
-        for tag in reversed(open_tags):
+        for tag in reversed(parser.open_tags):
             errors.append(f"Unclosed tag <'{tag}'>")
             
         return len(errors) == 0, errors
@@ -152,16 +466,21 @@ class CodeValidator:
         """
         errors = []
         
-        # Check for unmatched curly braces
-        open_braces = 0
-        for i, char in enumerate(code):
-            if char == '{':
-                open_braces += 1
-            elif char == '}':
-                open_braces -= 1
-                if open_braces < 0:
-                    errors.append(f"Unexpected closing brace at position {i}")
-                    open_braces = 0
+        # Check for unmatched curly braces. str.count settles the common
+        # cases in C; only stylesheets with closing braces get walked, and then
+        # only over brace positions rather than every character
+        closes = code.count('}')
+        open_braces = code.count('{') - closes
+        if closes:
+            open_braces = 0
+            for match in _BRACE_RE.finditer(code):
+                if match.group() == '{':
+                    open_braces += 1
+                else:
+                    open_braces -= 1
+                    if open_braces < 0:
+                        errors.append(f"Unexpected closing brace at position {match.start()}")
+                        open_braces = 0
         
         if open_braces > 0:
             errors.append(f"Missing {open_braces} closing brace(s)")
@@ -174,25 +493,26 @@ class CodeValidator:
         Validate a file's content based on its extension.
         Returns (success, [error_messages])
         """
-        ext = os.path.splitext(filename)[1].lower()
+        ext = '.' + filename.rpartition('.')[2].lower() if '.' in filename else ''
         
-        if ext in ['.js', '.jsx', '.ts', '.tsx']:
-            return CodeValidator.validate_javascript(content)
-        elif ext in ['.py']:
-            return CodeValidator.validate_python(content)
-        elif ext in ['.html', '.htm']:
-            return CodeValidator.validate_html(content)
-        elif ext in ['.css']:
-            return CodeValidator.validate_css(content)
-        else:
-            # For other files, we assume they are valid
-            return True, []
-            
+        # Regeneration loops often re-emit unchanged files
+        key = _validation_cache.key(ext, _available_tools(ext), content)
+        cached = _validation_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = _VALIDATORS.get(ext, _assume_valid)(content)
+        # Don't remember failures of the validator itself (timeouts, missing tools)
+        if not any(error.startswith("Validation error:") for error in result[1]):
+            _validation_cache.put(key, result)
+        return result
+    
     @staticmethod
-    def validate_project(files: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    def validate_project(files: Dict[str, Dict[str, str]], fail_fast: bool = False) -> Dict[str, Any]:
         """
         Validate all files in a project.
         Input: Dictionary of file category -> filename -> content
+        With fail_fast, stops at the first file with errors and returns partial results.
         Returns: Dictionary with validation results
         """
         validation_results = {
@@ -204,23 +524,42 @@ class CodeValidator:
             "fix_suggestions": {}
         }
         
-        for category, files_dict in files.items():
-            for filename, content in files_dict.items():
-                validation_results["file_count"] += 1
-                success, errors = CodeValidator.validate_file(filename, content)
+        entries = [
+            (category, filename, content)
+            for category, files_dict in files.items()
+            for filename, content in files_dict.items()
+        ]
+        futures: Dict[Future, Tuple[str, str, str]] = {}
+        if len(entries) >= _PARALLEL_THRESHOLD:
+            executor = _get_executor()
+            futures = {executor.submit(CodeValidator.validate_file, entry[1], entry[2]): entry for entry in entries}
+            # Fail-fast callers want the first error, not the first file's
+            order = as_completed(futures) if fail_fast else futures
+            outcomes = ((futures[future], future.result()) for future in order)
+        else:
+            outcomes = ((entry, CodeValidator.validate_file(entry[1], entry[2])) for entry in entries)
+        
+        for (category, filename, content), (success, errors) in outcomes:
+            validation_results["file_count"] += 1
+            
+            if not success:
+                validation_results["valid"] = False
+                validation_results["error_count"] += len(errors)
+                key = f"{category}/{filename}"
+                validation_results["errors"][key] = errors
                 
-                if not success:
-                    validation_results["valid"] = False
-                    validation_results["error_count"] += len(errors)
-                    key = f"{category}/{filename}"
-                    validation_results["errors"][key] = errors
+                # Generate fix suggestions where possible
+                if len(errors) > 0:
+                    validation_results["fix_suggestions"][key] = CodeValidator.generate_fix_suggestion(
+                        filename, content, errors
+                    )
+                
+                if fail_fast:
+                    # The executor is shared, so only this project's queued work is dropped
+                    for future in futures:
+                        future.cancel()
+                    break
                     
-                    # Generate fix suggestions where possible
-                    if len(errors) > 0:
-                        validation_results["fix_suggestions"][key] = CodeValidator.generate_fix_suggestion(
-                            filename, content, errors
-                        )
-                        
         # Add general recommendations if there are errors
         if not validation_results["valid"]:
             validation_results["warnings"].append(
@@ -234,22 +573,34 @@ class CodeValidator:
         """Generate suggestions to fix common errors"""
         suggestions = []
         
+        # Scan the errors once and note which kinds are present
+        unexpected_token = undefined = imports = False
+        indentation = name_error = import_error = False
+        for err in errors:
+            lowered = err.lower()
+            unexpected_token |= "Unexpected token" in err
+            undefined |= "undefined" in lowered
+            imports |= "import" in lowered
+            indentation |= "IndentationError" in err
+            name_error |= "NameError" in err
+            import_error |= "ImportError" in err
+        
         # Common JavaScript fixes
         if filename.endswith(('.js', '.jsx')):
-            if any("Unexpected token" in err for err in errors):
+            if unexpected_token:
                 suggestions.append("Check for missing semicolons, parentheses, or brackets")
-            if any("undefined" in err.lower() for err in errors):
+            if undefined:
                 suggestions.append("Check for undefined variables or imports")
-            if any("import" in err.lower() for err in errors):
+            if imports:
                 suggestions.append("Make sure all imports are properly defined and modules are installed")
                 
         # Common Python fixes
         if filename.endswith('.py'):
-            if any("IndentationError" in err for err in errors):
+            if indentation:
                 suggestions.append("Check for consistent indentation (spaces vs tabs)")
-            if any("NameError" in err for err in errors):
+            if name_error:
                 suggestions.append("Verify all variables are defined before use")
-            if any("ImportError" in err for err in errors):
+            if import_error:
                 suggestions.append("Ensure all imported modules are available and correctly spelled")
                 
         # General suggestions
@@ -317,6 +668,34 @@ class CodeValidator:
                 
         return fixed_content
 
+def _assume_valid(content: str) -> Tuple[bool, List[str]]:
+    # For other files, we assume they are valid
+    return True, []
+
+_JS_EXTENSIONS = frozenset({'.js', '.jsx', '.ts', '.tsx'})
+
+def _available_tools(ext: str) -> str:
+    """The checkers a file with this extension runs through, so results from a
+    degraded toolchain (no ESLint, no pylint) aren't replayed once it's complete"""
+    if ext == '.py':
+        return "pylint" if _pylint_run else "compile"
+    if ext in _JS_EXTENSIONS:
+        if not _have_node():
+            return "none"
+        return "eslint" if JsLintClient.get() is not None else "node"
+    return ""
+
+_VALIDATORS = {
+    '.js': CodeValidator.validate_javascript,
+    '.jsx': CodeValidator.validate_javascript,
+    '.ts': CodeValidator.validate_javascript,
+    '.tsx': CodeValidator.validate_javascript,
+    '.py': CodeValidator.validate_python,
+    '.html': CodeValidator.validate_html,
+    '.htm': CodeValidator.validate_html,
+    '.css': CodeValidator.validate_css,
+}
+
 # Example usage:
 # results = CodeValidator.validate_project(generated_code)
 # if not results["valid"]:
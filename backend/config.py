@@ -1,4 +1,6 @@
+import asyncio
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 import logging
 
@@ -21,35 +23,63 @@ OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "wizardcoder")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "3600"))  # Default 60 minutes timeout
 
-# Agent-specific model settings - using the same model for all agents by default
-# but allowing for different models per agent role
-AGENT_MODELS = {
-    "planner": os.getenv("PLANNER_MODEL", OLLAMA_MODEL),
-    "frontend": os.getenv("FRONTEND_MODEL", OLLAMA_MODEL),
-    "backend": os.getenv("BACKEND_MODEL", OLLAMA_MODEL),
-    "tester": os.getenv("TESTER_MODEL", OLLAMA_MODEL),
-    "deployment": os.getenv("DEPLOYMENT_MODEL", OLLAMA_MODEL),
-    "analyzer": os.getenv("ANALYZER_MODEL", OLLAMA_MODEL)
-}
-
-# Agent-specific timeout settings
-AGENT_TIMEOUTS = {
-    "planner": int(os.getenv("PLANNER_TIMEOUT", OLLAMA_TIMEOUT)),
-    "frontend": int(os.getenv("FRONTEND_TIMEOUT", OLLAMA_TIMEOUT)),
-    "backend": int(os.getenv("BACKEND_TIMEOUT", OLLAMA_TIMEOUT)),
-    "tester": int(os.getenv("TESTER_TIMEOUT", OLLAMA_TIMEOUT)),
-    "deployment": int(os.getenv("DEPLOYMENT_TIMEOUT", OLLAMA_TIMEOUT)),
-    "analyzer": int(os.getenv("ANALYZER_TIMEOUT", 600))  # Default 10 minutes for analyzer
-}
+# Agent-specific model and timeout settings - using the same model for all agents
+# by default but allowing for different models per agent role (PLANNER_MODEL, ...)
+AGENT_ROLES = ("planner", "frontend", "backend", "tester", "deployment", "analyzer")
+# Read-only views; the settings are fixed for the life of the process
+AGENT_MODELS = MappingProxyType({
+    role: os.getenv(f"{role.upper()}_MODEL", OLLAMA_MODEL) for role in AGENT_ROLES
+})
+AGENT_TIMEOUTS = MappingProxyType({
+    # Default 10 minutes for the analyzer
+    role: int(os.getenv(f"{role.upper()}_TIMEOUT", 600 if role == "analyzer" else OLLAMA_TIMEOUT))
+    for role in AGENT_ROLES
+})
+
+# Maximum number of agent tasks sent to Ollama concurrently within one run
+AGENT_MAX_PARALLEL = int(os.getenv("AGENT_MAX_PARALLEL", 2))
+
+# Maximum number of LLM calls in flight to Ollama across the whole process.
+# A single GPU time-slices concurrent generations, so more than 2-3 only thrashes it
+OLLAMA_MAX_INFLIGHT = int(os.getenv("OLLAMA_MAX_INFLIGHT", 2))
+OLLAMA_SEMAPHORE = asyncio.Semaphore(OLLAMA_MAX_INFLIGHT)
+
+# How long Ollama keeps a model loaded after the startup warmup request
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+def bool_env(name: str, default: str = "false") -> bool:
+    """Read a "true"/"false" environment flag"""
+    return os.getenv(name, default).lower() == "true"
 
 # Feature flags
-ENABLE_AGENT_LOGS = os.getenv("ENABLE_AGENT_LOGS", "true").lower() == "true"
-USE_MOCK_DATA = os.getenv("USE_MOCK_DATA", "false").lower() == "true"
+ENABLE_AGENT_LOGS = bool_env("ENABLE_AGENT_LOGS", "true")
+USE_MOCK_DATA = bool_env("USE_MOCK_DATA")
+ENABLE_PYLINT = bool_env("ENABLE_PYLINT")  # Slow; compile() covers syntax errors
+
+# Seconds each mock task pretends to work for in mock mode
+MOCK_SLEEP_SEC = float(os.getenv("MOCK_SLEEP_SEC", 0))
+
+# Task result cache (off by default), keyed by LLM, role, task definition and context outputs
+ENABLE_AGENT_CACHE = bool_env("ENABLE_AGENT_CACHE", "false")
+AGENT_CACHE_DIR = os.getenv("AGENT_CACHE_DIR", "/tmp/agent_cache")
+AGENT_CACHE_SIZE_LIMIT = int(os.getenv("AGENT_CACHE_SIZE_LIMIT", 1 << 30))  # Default 1 GiB
+
+# Number of jobs whose status, results and logs are kept in memory
+MAX_TRACKED_JOBS = int(os.getenv("MAX_TRACKED_JOBS", 500))
+
+# Seconds a completed or failed job is kept before it is dropped
+JOB_TTL = int(os.getenv("JOB_TTL", 3600))
+
+# SQLite file that finished jobs' results are moved to, out of memory; empty keeps them in memory
+JOB_RESULTS_DB = os.getenv("JOB_RESULTS_DB", "/tmp/job_results.sqlite3")
+
+# Full per-job logs are appended here as <job_id>.jsonl; only the recent tail stays in memory
+JOB_LOG_DIR = os.getenv("JOB_LOG_DIR", "/tmp/job_logs")
 
 # CORS settings
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
 
 logger.info(f"Configured with OLLAMA_HOST={OLLAMA_HOST}, OLLAMA_MODEL={OLLAMA_MODEL}, OLLAMA_TIMEOUT={OLLAMA_TIMEOUT}")
-logger.info(f"Agent models: {AGENT_MODELS}")
-logger.info(f"Agent timeouts: {AGENT_TIMEOUTS}")
+logger.info(f"Agent models: {dict(AGENT_MODELS)}")
+logger.info(f"Agent timeouts: {dict(AGENT_TIMEOUTS)}")
 logger.info(f"Mock data mode: {USE_MOCK_DATA}")
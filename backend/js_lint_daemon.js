@@ -0,0 +1,72 @@
+// Long-lived ESLint worker pool used by code_validator.JsLintClient.
+// Reads newline-delimited JSON {id, code} on stdin and writes {id, errors}
+// to stdout, so ESLint is loaded once instead of per validated file.
+const cluster = require('cluster');
+const os = require('os');
+const readline = require('readline');
+
+const LINT_CONFIG = {
+  languageOptions: {
+    ecmaVersion: 'latest',
+    sourceType: 'module',
+    parserOptions: { ecmaFeatures: { jsx: true } },
+  },
+};
+
+if (cluster.isPrimary) {
+  const size = Number(process.env.JS_LINT_WORKERS) || os.cpus().length;
+  const workers = [];
+  let next = 0;
+  let ready = 0;
+
+  const reply = (message) => process.stdout.write(JSON.stringify(message) + '\n');
+
+  for (let i = 0; i < size; i++) {
+    const worker = cluster.fork();
+    worker.on('message', (message) => {
+      if (message.ready === false) {
+        reply(message);
+        process.exit(1);
+      } else if (message.ready) {
+        if (++ready === size) reply({ ready: true });
+      } else {
+        reply(message);
+      }
+    });
+    workers.push(worker);
+  }
+
+  cluster.on('exit', (worker, code) => {
+    if (code !== 0) process.exit(1);
+  });
+
+  // Round-robin requests over the workers
+  readline.createInterface({ input: process.stdin }).on('line', (line) => {
+    if (!line.trim()) return;
+    workers[next].send(JSON.parse(line));
+    next = (next + 1) % workers.length;
+  }).on('close', () => process.exit(0));
+} else {
+  let linter;
+  try {
+    const { Linter } = require('eslint');
+    linter = new Linter({ configType: 'flat' });
+  } catch (error) {
+    process.send({ ready: false, error: String(error).split('\n')[0] });
+    return;
+  }
+  process.send({ ready: true });
+
+  process.on('message', ({ id, code }) => {
+    let errors;
+    try {
+      errors = linter
+        .verify(code, LINT_CONFIG)
+        .filter((m) => m.severity === 2)
+        .map((m) => `${m.line}:${m.column} ${m.message}`);
+    } catch (error) {
+      errors = [`ESLint error: ${error.message}`];
+    }
+    process.send({ id, errors });
+  });
+}
@@ -0,0 +1,47 @@
+// Long-lived syntax checker used by code_validator.JsSyntaxClient.
+// Same protocol as js_lint_daemon.js: newline-delimited JSON {id, code} on
+// stdin, {id, errors} on stdout. Compiles each script the way `node --check`
+// does (as a CommonJS module body) without running it or starting a new node.
+// Sources that only parse as an ES module (import/export) are retried with
+// vm.SourceTextModule, which needs node's --experimental-vm-modules flag.
+const readline = require('readline');
+const vm = require('vm');
+
+const CJS_PARAMS = ['exports', 'require', 'module', '__filename', '__dirname'];
+
+const reply = (message) => process.stdout.write(JSON.stringify(message) + '\n');
+
+// Keep the location and message, drop the daemon's own stack frames
+const formatError = (error) => {
+  const stack = String(error.stack).split('\n');
+  const end = stack.findIndex((l) => l.startsWith(error.name));
+  return stack.slice(0, end + 1).filter((l) => l.trim());
+};
+
+const compile = (code) => {
+  try {
+    vm.compileFunction(code, CJS_PARAMS, { filename: '[stdin]' });
+  } catch (error) {
+    if (!(error instanceof SyntaxError) || typeof vm.SourceTextModule !== 'function') throw error;
+    try {
+      new vm.SourceTextModule(code, { identifier: '[stdin]' });
+    } catch (moduleError) {
+      // Report the CommonJS error for scripts that aren't modules either
+      throw /\b(import|export)\b/.test(code) ? moduleError : error;
+    }
+  }
+};
+
+reply({ ready: true });
+
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  if (!line.trim()) return;
+  const { id, code } = JSON.parse(line);
+  let errors = [];
+  try {
+    compile(code);
+  } catch (error) {
+    errors = formatError(error);
+  }
+  reply({ id, errors });
+}).on('close', () => process.exit(0));
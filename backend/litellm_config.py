@@ -2,12 +2,16 @@ import litellm
 import logging
 from config import OLLAMA_TIMEOUT
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging itself is set up by config
 logger = logging.getLogger(__name__)
 
+_CONFIGURED = False
+
 def configure_litellm():
-    """Configure LiteLLM with appropriate settings"""
+    """Configure LiteLLM with appropriate settings (once per process)"""
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
     try:
         # Set timeout from config
         litellm.request_timeout = OLLAMA_TIMEOUT
@@ -28,6 +32,7 @@ def configure_litellm():
         logger.info(f"LiteLLM configured with timeout: {litellm.request_timeout} seconds")
         logger.info(f"LiteLLM retry settings: {litellm.num_retries} retries with {litellm.retry_after}s delay")
         logger.info(f"Optimized settings for WizardCoder model")
+        _CONFIGURED = True
     except Exception as e:
         logger.error(f"Error configuring LiteLLM: {e}")
 
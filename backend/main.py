@@ -7,18 +7,27 @@ import json
 import os
 import uuid
 import time
-from typing import Dict, List, Optional, Any
+from typing import IO, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple, Any
 from prompt_analyzer import PromptAnalyzer
 from prompt_analyzer import create_analyzer
+import array
 import asyncio
+import functools
 import json
 import os
 import uuid
 import logging
+import hashlib
+import sqlite3
+import threading
+from collections import ChainMap, OrderedDict, deque
+from queue import SimpleQueue
+from dataclasses import dataclass, field
 from datetime import datetime
 
 # Import our code validator
 from code_validator import CodeValidator
+from code_templates import has_placeholders
 
 # Import preview server functionality
 from dotenv import load_dotenv
@@ -38,7 +47,7 @@ import litellm
 from litellm.exceptions import APIConnectionError
 
 # Import config to check if we're using mock data
-from config import USE_MOCK_DATA, OLLAMA_MODEL, OLLAMA_HOST, OLLAMA_TIMEOUT
+from config import USE_MOCK_DATA, OLLAMA_MODEL, OLLAMA_HOST, OLLAMA_TIMEOUT, OLLAMA_SEMAPHORE, MAX_TRACKED_JOBS, JOB_LOG_DIR, JOB_TTL, JOB_RESULTS_DB, MOCK_SLEEP_SEC
 
 # Import agent orchestration system only if not using mock data
 if not USE_MOCK_DATA:
@@ -48,13 +57,18 @@ if not USE_MOCK_DATA:
     except ImportError:
         logger.warning("CrewAI not installed. Only mock mode will work.")
 
-# Import ollama for LLM interactions
-import ollama
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Use uvloop's faster event loop when it is installed (it isn't available on Windows).
+# uvicorn already prefers it; this also covers running main.py directly
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    logger.info("uvloop not installed. Using the default asyncio event loop.")
+
 # Create FastAPI app
 app = FastAPI(title="AI Agent App Builder API")
 
@@ -70,168 +84,479 @@ app.add_middleware(
 # Initialize the preview server
 app = setup_preview_server(app)
 
+# Keywords in agent log lines and the progress level each one implies:
+# just started, thinking about the task, executing it, generating content, almost done
+_PROGRESS_RE = re.compile(
+    r"(?P<p10>started|initializing)|(?P<p30>thinking)|(?P<p50>executing)"
+    r"|(?P<p70>generating|creating)|(?P<p90>finalizing|reviewing)",
+    re.IGNORECASE,
+)
+_PROGRESS_LEVELS = {"p10": 10, "p30": 30, "p50": 50, "p70": 70, "p90": 90}
+
+# Agent roles named in CrewAI task status lines, grouped by progress key
+_CREW_ROLE_RE = re.compile(
+    r"(?P<planner>Planning Architect)|(?P<backend>Backend Engineer)|(?P<frontend>Frontend Developer)"
+    r"|(?P<tester>Quality|QA)|(?P<deployment>DevOps)"
+)
+
+def _first_group(pattern: re.Pattern, text: str) -> Optional[str]:
+    """Name of the first group of pattern, in pattern order, that matches anywhere in
+    text; a keyword's priority doesn't depend on where it appears in the text"""
+    return min((match.lastgroup for match in pattern.finditer(text)),
+               key=pattern.groupindex.__getitem__, default=None)
+
+# WebSocket frames are encoded with orjson when it is installed
+try:
+    import orjson
+    
+    def _dumps(payload: Any) -> str:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    logger.warning("orjson not installed. WebSocket messages will use the json module.")
+    
+    def _dumps(payload: Any) -> str:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    
+    _loads = json.loads
+
+_last_timestamp = (0, "")
+
+def _iso_now() -> str:
+    """Current local time as an ISO string; log timestamps only need whole seconds,
+    so the string is rebuilt once a second instead of per message"""
+    global _last_timestamp
+    second = int(time.time())
+    if second != _last_timestamp[0]:
+        _last_timestamp = (second, datetime.fromtimestamp(second).isoformat())
+    return _last_timestamp[1]
+
+class _LRUDict(OrderedDict):
+    """Dict that keeps at most maxsize entries, dropping the least recently used.
+    on_evict, when given, is called with the key and value of each dropped entry"""
+    
+    def __init__(self, maxsize: int, on_evict: Optional[Callable[[Any, Any], None]] = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+    
+    def __getitem__(self, key):
+        # Reads count as use, so a job that is still running isn't evicted
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            key, value = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+# Log lines kept in memory per job for replaying to a client that (re)connects
+_LOG_REPLAY_LINES = 200
+# Seconds a single client gets to accept a message, and how many messages may queue
+# up for it, before it is disconnected
+_SEND_TIMEOUT = 5
+_SEND_QUEUE_SIZE = 1000
+
+class LogEntry(NamedTuple):
+    """One agent log line; stored as a tuple and turned into a dict only when sent.
+    seq numbers a job's lines from 1 so a reconnecting client can ask for the rest"""
+    seq: int
+    timestamp: str
+    agent: str
+    message: str
+    status: str
+    progress: Optional[int] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {
+            "seq": self.seq,
+            "timestamp": self.timestamp,
+            "agent": self.agent,
+            "message": self.message,
+            "status": self.status
+        }
+        if self.progress is not None:
+            entry["progress"] = self.progress
+        return entry
+
+# Progress keys for the roles of the agents created below
+_ROLE_TO_KEY = {
+    "Planning Architect": "planner",
+    "Frontend Developer": "frontend",
+    "Backend Engineer": "backend",
+    "Quality Assurance Engineer": "tester",
+    "DevOps Engineer": "deployment",
+}
+# Fallback for roles that only contain one of those names, checked in order
+_ROLE_SUBSTRINGS = (
+    ("Planning Architect", "planner"),
+    ("Backend Engineer", "backend"),
+    ("Frontend Developer", "frontend"),
+    ("Quality Assurance", "tester"),
+    ("QA Engineer", "tester"),
+    ("DevOps Engineer", "deployment"),
+)
+# Lowercase fallback for any other agent name, checked in order: our own role
+# names, then the substrings the frontend places log lines by
+_AGENT_NAME_SUBSTRINGS = tuple((name.lower(), key) for name, key in _ROLE_SUBSTRINGS) + (
+    ("planning", "planner"),
+    ("architect", "planner"),
+    ("front", "frontend"),
+    ("back", "backend"),
+    ("quality", "tester"),
+    ("qa", "tester"),
+    ("test", "tester"),
+    ("devops", "deployment"),
+    ("deploy", "deployment"),
+)
+
+# Progress keys, in the order clients receive them
+_PROGRESS_KEYS = ("planner", "backend", "frontend", "tester", "deployment")
+
+class _ProgressTable:
+    """Per-agent progress of at most maxsize jobs, kept as one int array per agent
+    with a row for each job. The least recently used job is dropped when a new
+    one would go over maxsize, and its row is reused"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._rows: Dict[str, int] = OrderedDict()
+        self._free_rows: List[int] = []
+        self._columns = {key: array.array('i') for key in _PROGRESS_KEYS}
+    
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._rows
+    
+    def add(self, job_id: str):
+        """Start tracking a job with every agent at 0, unless it is already tracked"""
+        if job_id in self._rows:
+            return
+        if len(self._rows) >= self.maxsize:
+            self._free_rows.append(self._rows.popitem(last=False)[1])
+        if self._free_rows:
+            row = self._free_rows.pop()
+            for column in self._columns.values():
+                column[row] = 0
+        else:
+            row = len(self._columns["planner"])
+            for column in self._columns.values():
+                column.append(0)
+        self._rows[job_id] = row
+    
+    def _row(self, job_id: str) -> int:
+        # Reads count as use, so a job that is still running isn't dropped
+        row = self._rows[job_id]
+        self._rows.move_to_end(job_id)
+        return row
+    
+    def get(self, job_id: str, key: str) -> int:
+        return self._columns[key][self._row(job_id)]
+    
+    def set(self, job_id: str, key: str, value: int):
+        self._columns[key][self._row(job_id)] = value
+    
+    def snapshot(self, job_id: str) -> Optional[Dict[str, int]]:
+        """The job's progress as a new dict, or None if it isn't tracked"""
+        if job_id not in self._rows:
+            return None
+        row = self._row(job_id)
+        return {key: column[row] for key, column in self._columns.items()}
+
+def _read_log_range(path: str, start: int, end: int) -> List[str]:
+    """The encoded frames between two byte offsets of a log file"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode("utf-8").splitlines()
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.job_logs: Dict[str, List[Dict[str, Any]]] = {}
-        self.agent_progress: Dict[str, Dict[str, int]] = {}  # Track progress per agent per job
+        self.active_connections: Dict[str, List[WebSocket]] = {}  # Every client watching a job
+        # Each client has an outgoing queue drained by its own writer task, so code
+        # that logs never waits on a slow socket
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        # Bounded so finished jobs don't keep their logs for the life of the process.
+        # Only the recent tail is held in memory; the full history is appended to
+        # JOB_LOG_DIR/<job_id>.jsonl, which is deleted along with the job
+        self.job_logs: Dict[str, Deque[LogEntry]] = _LRUDict(MAX_TRACKED_JOBS, lambda job_id, _: self.forget(job_id))
+        self._log_files: Dict[str, IO[str]] = {}
+        # Jobs that sent their final status; later lines are appended without keeping the file open
+        self._finished_logs: Set[str] = set()
+        # Byte offset of each of a job's lines in its log file, then the file's end.
+        # Line n has seq n, so older lines are read with one seek, and the count
+        # outlives the in-memory tail so seq never restarts
+        self._log_offsets: Dict[str, array.array] = _LRUDict(MAX_TRACKED_JOBS)
+        self.agent_progress = _ProgressTable(MAX_TRACKED_JOBS)  # Track progress per agent per job
+        self.last_sent_progress: Dict[str, Dict[str, int]] = _LRUDict(MAX_TRACKED_JOBS)  # Progress as last pushed to the client
 
     async def connect(self, websocket: WebSocket, job_id: str):
         await websocket.accept()
-        self.active_connections[job_id] = websocket
-        self.job_logs[job_id] = []
-        self.agent_progress[job_id] = {
-            "planner": 0,
-            "backend": 0,
-            "frontend": 0,
-            "tester": 0,
-            "deployment": 0
-        }
+        self.active_connections.setdefault(job_id, []).append(websocket)
+        queue = self._queues[websocket] = asyncio.Queue(maxsize=_SEND_QUEUE_SIZE)
+        self._writers[websocket] = asyncio.create_task(self._write(job_id, websocket, queue))
+        self.last_sent_progress.pop(job_id, None)
+        # Keep what the job already logged so it can be replayed to this client
+        if job_id not in self.job_logs:
+            self.job_logs[job_id] = deque(maxlen=_LOG_REPLAY_LINES)
+        self.agent_progress.add(job_id)
         
-    def disconnect(self, job_id: str):
-        if job_id in self.active_connections:
-            del self.active_connections[job_id]
+    def disconnect(self, job_id: str, websocket: WebSocket):
+        sockets = self.active_connections.get(job_id)
+        if sockets and websocket in sockets:
+            sockets.remove(websocket)
+        if not sockets:
+            self.active_connections.pop(job_id, None)
+            self._close_log_file(job_id)
+        self._queues.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+    
+    async def _write(self, job_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """Send one client's queued messages in order until it goes away"""
+        try:
+            while True:
+                text = await queue.get()
+                await asyncio.wait_for(websocket.send_text(text), _SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Dropping WebSocket client of job {job_id}: {e!r}")
+            self.disconnect(job_id, websocket)
+    
+    def _enqueue(self, job_id: str, websocket: WebSocket, text: str):
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(text)
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping WebSocket client of job {job_id}: {_SEND_QUEUE_SIZE} messages behind")
+            self.disconnect(job_id, websocket)
+    
+    def send_to(self, job_id: str, websocket: WebSocket, payload: Dict[str, Any]):
+        """Queue a message for one client of a job"""
+        self._enqueue(job_id, websocket, _dumps(payload))
+    
+    def broadcast(self, job_id: str, payload: Dict[str, Any]):
+        """Queue one message for every client of a job, encoding it once"""
+        text = _dumps(payload)
+        for websocket in list(self.active_connections.get(job_id, ())):
+            self._enqueue(job_id, websocket, text)
             
-    async def send_log(self, job_id: str, agent: str, message: str, status: str = "running"):
+    def _record_log(self, job_id: str, agent: str, message: str, status: str) -> Dict[str, Any]:
+        """Update progress for a log line, store it, and return its frame"""
         # Determine agent key for progress tracking
         agent_key = self._get_agent_key(agent)
+        progress = self.agent_progress
+        tracked = agent_key is not None and job_id in progress
         
         # Update progress based on message content and status
-        if agent_key and job_id in self.agent_progress:
+        if tracked:
             if status == "completed":
-                self.agent_progress[job_id][agent_key] = 100
+                progress.set(job_id, agent_key, 100)
             elif status == "running":
                 # Increment progress based on message content
-                current_progress = self.agent_progress[job_id][agent_key]
+                current_progress = progress.get(job_id, agent_key)
                 
-                if "started" in message.lower() or "initializing" in message.lower():
-                    # Just started
-                    self.agent_progress[job_id][agent_key] = max(current_progress, 10)
-                elif "thinking" in message.lower():
-                    # Thinking about the task
-                    self.agent_progress[job_id][agent_key] = max(current_progress, 30)
-                elif "executing" in message.lower():
-                    # Executing the task
-                    self.agent_progress[job_id][agent_key] = max(current_progress, 50)
-                elif "generating" in message.lower() or "creating" in message.lower():
-                    # Generating content
-                    self.agent_progress[job_id][agent_key] = max(current_progress, 70)
-                elif "finalizing" in message.lower() or "reviewing" in message.lower():
-                    # Almost done
-                    self.agent_progress[job_id][agent_key] = max(current_progress, 90)
-                # Special handling for CrewAI task status messages
-                elif "🚀 Crew:" in message:
-                    # This is a task status update
-                    if "Status: ✅" in message:
-                        # Task completed
-                        if "Planning Architect" in message:
-                            self.agent_progress[job_id]["planner"] = 100
-                        elif "Backend Engineer" in message:
-                            self.agent_progress[job_id]["backend"] = 100
-                        elif "Frontend Developer" in message:
-                            self.agent_progress[job_id]["frontend"] = 100
-                        elif "Quality" in message or "QA" in message:
-                            self.agent_progress[job_id]["tester"] = 100
-                        elif "DevOps" in message:
-                            self.agent_progress[job_id]["deployment"] = 100
-                    else:
-                        # Task in progress
-                        if "Planning Architect" in message:
-                            self.agent_progress[job_id]["planner"] = max(self.agent_progress[job_id]["planner"], 50)
-                        elif "Backend Engineer" in message:
-                            self.agent_progress[job_id]["backend"] = max(self.agent_progress[job_id]["backend"], 50)
-                        elif "Frontend Developer" in message:
-                            self.agent_progress[job_id]["frontend"] = max(self.agent_progress[job_id]["frontend"], 50)
-                        elif "Quality" in message or "QA" in message:
-                            self.agent_progress[job_id]["tester"] = max(self.agent_progress[job_id]["tester"], 50)
-                        elif "DevOps" in message:
-                            self.agent_progress[job_id]["deployment"] = max(self.agent_progress[job_id]["deployment"], 50)
-                elif "Task Completion" in message:
-                    # Task completed message box
-                    if "Planning Architect" in message:
-                        self.agent_progress[job_id]["planner"] = 100
-                    elif "Backend Engineer" in message:
-                        self.agent_progress[job_id]["backend"] = 100
-                    elif "Frontend Developer" in message:
-                        self.agent_progress[job_id]["frontend"] = 100
-                    elif "Quality" in message or "QA" in message:
-                        self.agent_progress[job_id]["tester"] = 100
-                    elif "DevOps" in message:
-                        self.agent_progress[job_id]["deployment"] = 100
+                stage = _first_group(_PROGRESS_RE, message)
+                if stage:
+                    progress.set(job_id, agent_key, max(current_progress, _PROGRESS_LEVELS[stage]))
+                # Special handling for CrewAI task status messages and completion boxes
+                elif "🚀 Crew:" in message or "Task Completion" in message:
+                    key = _first_group(_CREW_ROLE_RE, message)
+                    if key:
+                        if "🚀 Crew:" not in message or "Status: ✅" in message:
+                            progress.set(job_id, key, 100)
+                        else:
+                            progress.set(job_id, key, max(progress.get(job_id, key), 50))
                 else:
                     # Generic progress update - increment slightly
-                    self.agent_progress[job_id][agent_key] = min(95, current_progress + 5)
-        
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "agent": agent,
-            "message": message,
-            "status": status
-        }
+                    progress.set(job_id, agent_key, min(95, current_progress + 5))
         
         # Add progress information if available
-        if agent_key and job_id in self.agent_progress:
-            log_entry["progress"] = self.agent_progress[job_id][agent_key]
+        entry_progress = progress.get(job_id, agent_key) if tracked else None
         
         # Store log
         if job_id not in self.job_logs:
-            self.job_logs[job_id] = []
-        self.job_logs[job_id].append(log_entry)
+            self.job_logs[job_id] = deque(maxlen=_LOG_REPLAY_LINES)
+        job_logs = self.job_logs[job_id]
+        offsets = self._line_offsets(job_id)
+        log_entry = LogEntry(len(offsets), _iso_now(), agent, message, status, entry_progress)
+        job_logs.append(log_entry)
+        frame = log_entry.to_dict()
+        line = _dumps(frame) + "\n"
+        self._write_log_line(job_id, line)
+        offsets.append(offsets[-1] + len(line.encode("utf-8")))
+        return frame
         
-        # Send to websocket if connected
+    def _attach_progress(self, job_id: str, frame: Dict[str, Any]):
+        # Progress rides along in the same frame, and only when it changed
+        snapshot = self.agent_progress.snapshot(job_id)
+        if snapshot is not None and snapshot != self.last_sent_progress.get(job_id):
+            frame["progress_update"] = snapshot
+            self.last_sent_progress[job_id] = snapshot
+    
+    async def send_log(self, job_id: str, agent: str, message: str, status: str = "running"):
+        frame = self._record_log(job_id, agent, message, status)
+        
+        # Send to websockets if connected
         if job_id in self.active_connections:
-            await self.active_connections[job_id].send_json(log_entry)
-            
-            # Also send a progress update message
-            if job_id in self.agent_progress:
-                await self.active_connections[job_id].send_json({
-                    "type": "progress_update",
-                    "progress": self.agent_progress[job_id],
-                    "timestamp": datetime.now().isoformat()
-                })
+            self._attach_progress(job_id, frame)
+            self.broadcast(job_id, frame)
+    
+    async def send_log_batch(self, job_id: str, entries: List[Tuple[str, str, str]]):
+        """Log several (agent, message, status) lines at once, sent to clients as
+        one log_lines frame"""
+        logs = [self._record_log(job_id, agent, message, status) for agent, message, status in entries]
+        if logs and job_id in self.active_connections:
+            frame = {"type": "log_lines", "logs": logs}
+            self._attach_progress(job_id, frame)
+            self.broadcast(job_id, frame)
             
-    def get_logs(self, job_id: str) -> List[Dict[str, Any]]:
-        return self.job_logs.get(job_id, [])
+    async def send_job_status(self, job_id: str, status: str, websocket: Optional[WebSocket] = None, **payload):
+        """Push the terminal job state so clients can stop listening without polling.
+        Goes to every client of the job, or only to websocket when given"""
+        message = {
+            "type": "job_status",
+            "status": status,
+            **payload,
+            "timestamp": _iso_now()
+        }
+        if websocket is not None:
+            self.send_to(job_id, websocket, message)
+            return
+        self._close_log_file(job_id)
+        self._finished_logs.add(job_id)
+        self.broadcast(job_id, message)
+
+    async def send_logs_batch(self, job_id: str, websocket: WebSocket):
+        """Queue a logs_batch frame with all of the job's logs for one client. Lines
+        read from the log file are already encoded frames, so they are spliced in as they are"""
+        older, tail = await self._split_logs(job_id)
+        lines = older + [_dumps(entry.to_dict()) for entry in tail]
+        self._enqueue(job_id, websocket, '{"type":"logs_batch","logs":[%s],"timestamp":%s}' % (
+            ",".join(lines), _dumps(_iso_now())))
+    
+    async def _split_logs(self, job_id: str, since: int = 0, full_history: bool = True) -> Tuple[List[str], List[LogEntry]]:
+        """The job's logs after seq since: encoded frames that have left the in-memory
+        tail (read from its log file off the event loop), then the tail's entries"""
+        if job_id not in self.job_logs:
+            return [], []
+        # Taken before reading the file so lines logged meanwhile can't leave a gap
+        tail = [entry for entry in self.job_logs[job_id] if entry.seq > since]
+        offsets = self._line_offsets(job_id)
+        first = tail[0].seq if tail else len(offsets)
+        if first <= since + 1 or not (full_history or since):
+            return [], tail
+        log_file = self._log_files.get(job_id)
+        if log_file is not None:
+            log_file.flush()
+        try:
+            older = await asyncio.to_thread(_read_log_range, self._log_path(job_id), offsets[since], offsets[first - 1])
+        except OSError as e:
+            logger.warning(f"Could not read log file for job {job_id}, returning recent logs only: {e}")
+            return [], tail
+        return older, tail
+    
+    async def get_logs(self, job_id: str, full_history: bool = True, since: int = 0) -> List[Dict[str, Any]]:
+        """The job's logs after seq since, from its log file or only the in-memory tail.
+        The file is still read for the tail when lines after since have left memory"""
+        older, tail = await self._split_logs(job_id, since, full_history)
+        return [_loads(line) for line in older] + [entry.to_dict() for entry in tail]
+    
+    def _line_offsets(self, job_id: str) -> array.array:
+        offsets = self._log_offsets.get(job_id)
+        if offsets is None:
+            # Dropped or never started; index whatever the log file already holds
+            offsets = self._log_offsets[job_id] = array.array('q', [0])
+            log_file = self._log_files.get(job_id)
+            if log_file is not None:
+                log_file.flush()
+            try:
+                with open(self._log_path(job_id), "rb") as f:
+                    for line in f:
+                        offsets.append(offsets[-1] + len(line))
+            except FileNotFoundError:
+                pass
+        return offsets
+    
+    @staticmethod
+    def _log_path(job_id: str) -> str:
+        return os.path.join(JOB_LOG_DIR, f"{job_id}.jsonl")
+    
+    def _write_log_line(self, job_id: str, line: str):
+        if job_id in self._finished_logs:
+            # Late lines of a finished job (e.g. from fix_validation_issues) would
+            # otherwise reopen a handle that nothing closes again
+            with open(self._log_path(job_id), "a", encoding="utf-8", newline="\n") as f:
+                f.write(line)
+        else:
+            self._log_file(job_id).write(line)
+    
+    def _log_file(self, job_id: str) -> IO[str]:
+        # Opened lazily and reopened in append mode after a disconnect
+        log_file = self._log_files.get(job_id)
+        if log_file is None:
+            os.makedirs(JOB_LOG_DIR, exist_ok=True)
+            log_file = self._log_files[job_id] = open(self._log_path(job_id), "a", buffering=8192, encoding="utf-8", newline="\n")
+        return log_file
+    
+    def _close_log_file(self, job_id: str):
+        log_file = self._log_files.pop(job_id, None)
+        if log_file is not None:
+            log_file.close()
+    
+    def forget(self, job_id: str):
+        """Drop a job's logs, from memory and from JOB_LOG_DIR"""
+        self.job_logs.pop(job_id, None)
+        self._log_offsets.pop(job_id, None)
+        self._finished_logs.discard(job_id)
+        self._close_log_file(job_id)
+        try:
+            os.remove(self._log_path(job_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete log file for job {job_id}: {e}")
     
     def _get_agent_key(self, agent_name: str) -> Optional[str]:
         """Map agent name to a standard key for progress tracking"""
+        # Logs almost always carry one of our own agents' exact role names
+        key = _ROLE_TO_KEY.get(agent_name)
+        if key is not None:
+            return key
         agent_lower = agent_name.lower()
-        
-        if "planning" in agent_lower or "architect" in agent_lower:
-            return "planner"
-        elif "front" in agent_lower:
-            return "frontend"
-        elif "back" in agent_lower:
-            return "backend"
-        elif "quality" in agent_lower or "qa" in agent_lower or "test" in agent_lower:
-            return "tester"
-        elif "devops" in agent_lower or "deploy" in agent_lower:
-            return "deployment"
-        
-        return None
+        return next((key for name, key in _AGENT_NAME_SUBSTRINGS if name in agent_lower), None)
 
 manager = ConnectionManager()
 
-# Mock classes for mock mode
+# Mock classes for mock mode. eq=False keeps identity comparison and hashing,
+# like the CrewAI objects they stand in for
+@dataclass(slots=True, frozen=True, eq=False)
 class MockAgent:
-    def __init__(self, role, goal, backstory, **kwargs):
-        self.role = role
-        self.goal = goal
-        self.backstory = backstory
+    role: str
+    goal: str
+    backstory: str
 
+@dataclass(slots=True, frozen=True, eq=False)
 class MockTask:
-    def __init__(self, description, expected_output, agent, context=None, **kwargs):
-        self.description = description
-        self.expected_output = expected_output
-        self.agent = agent
-        self.context = context or []
+    description: str
+    expected_output: str
+    agent: MockAgent
+    context: List["MockTask"] = field(default_factory=list)
 
+@dataclass(slots=True, frozen=True, eq=False)
 class MockCrew:
-    def __init__(self, agents, tasks, **kwargs):
-        self.agents = agents
-        self.tasks = tasks
-        self.callbacks = {}
+    agents: List[MockAgent]
+    tasks: List[MockTask]
+    callbacks: Dict[str, Any] = field(default_factory=dict)
     
     def on_agent_start(self, callback):
         self.callbacks['agent_start'] = callback
@@ -248,7 +573,9 @@ class MockCrew:
             # In a real implementation, this would contain task outputs
         return results
 
-# Agent definitions
+# Agent definitions. Built per job: a Crew rebuilds its agents' executors and the
+# executor keeps per-run state (iterations, last used tool), so two jobs' crews
+# running at once must not share agent instances
 def create_planner_agent():
     if USE_MOCK_DATA:
         return MockAgent(
@@ -358,8 +685,203 @@ class JobStatus(BaseModel):
     status: str
     results: Optional[Dict[str, Any]] = None
 
-# Store for job results
-jobs = {}
+class JobStore:
+    """Jobs by id, split over shards that each have their own lock, since the
+    generate endpoint runs in FastAPI's threadpool while the rest run on the event
+    loop. Each shard drops its least recently used job past its share of maxsize,
+    and finished jobs are dropped by evict_expired once they are ttl seconds old.
+    
+    With results_db, a finished job's results are moved out of memory into that
+    SQLite file by a writer thread, and get returns a copy of the job with them
+    read back in. Until the write lands, the results stay in memory.
+    on_evict, when given, is called with the id of every job that is dropped, after
+    the shard's lock is released and on whichever thread dropped it"""
+    
+    _SHARDS = 16
+    _FINISHED = ("completed", "failed")
+    
+    def __init__(self, maxsize: int, ttl: float, results_db: str = "", on_evict: Optional[Callable[[str], None]] = None):
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._shard_size = max(1, -(-maxsize // self._SHARDS))
+        # (lock, jobs in LRU order, monotonic time each finished job finished,
+        #  ids of jobs whose results are in results_db)
+        self._shards = [(threading.Lock(), OrderedDict(), {}, set()) for _ in range(self._SHARDS)]
+        self._db = None
+        if results_db:
+            try:
+                os.makedirs(os.path.dirname(results_db) or ".", exist_ok=True)
+                self._db = sqlite3.connect(results_db, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("CREATE TABLE IF NOT EXISTS results (job_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+                # Jobs don't survive a restart, so neither do their results
+                self._db.execute("DELETE FROM results")
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open job results database {results_db}, keeping results in memory: {e}")
+                self._db = None
+        self._db_lock = threading.Lock()
+        # ("put", job_id, results) and ("delete", job_id, None) requests, applied in order
+        self._writes: SimpleQueue = SimpleQueue()
+        # Results queued for writing per job, so an unchanged job isn't queued again
+        self._pending: Dict[str, Any] = {}
+        if self._db is not None:
+            threading.Thread(target=self._write_results, daemon=True).start()
+    
+    def _shard(self, job_id: str):
+        return self._shards[hash(job_id) & (self._SHARDS - 1)]
+    
+    def __contains__(self, job_id: str) -> bool:
+        lock, jobs, _, _ = self._shard(job_id)
+        with lock:
+            return job_id in jobs
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        lock, jobs, _, spilled = self._shard(job_id)
+        with lock:
+            job = jobs.get(job_id)
+            if job is None:
+                return None
+            jobs.move_to_end(job_id)
+            if job_id not in spilled:
+                return job
+            with self._db_lock:
+                row = self._db.execute("SELECT data FROM results WHERE job_id = ?", (job_id,)).fetchone()
+        # A copy, so changes to its results must be saved with update
+        return {**job, "results": _loads(row[0]) if row else None}
+    
+    def set(self, job_id: str, job: Dict[str, Any]):
+        """Replace the job's whole record"""
+        shard = self._shard(job_id)
+        with shard[0]:
+            shard[1][job_id] = job
+            shard[3].discard(job_id)
+            evicted = self._touch(shard, job_id, job)
+        self._evicted(evicted)
+    
+    def update(self, job_id: str, **fields) -> Dict[str, Any]:
+        """Set fields of the job's record, creating it if it was dropped"""
+        shard = self._shard(job_id)
+        with shard[0]:
+            job = shard[1].setdefault(job_id, {"job_id": job_id})
+            job.update(fields)
+            if "results" in fields:
+                shard[3].discard(job_id)
+            evicted = self._touch(shard, job_id, job)
+        self._evicted(evicted)
+        return job
+    
+    def _evicted(self, job_id: Optional[str]):
+        if job_id is not None and self.on_evict is not None:
+            self.on_evict(job_id)
+    
+    def _touch(self, shard, job_id: str, job: Dict[str, Any]) -> Optional[str]:
+        # Called with the shard's lock held after the job was written; returns the
+        # id of the job this pushed out of the shard, if any
+        _, jobs, finished_at, spilled = shard
+        jobs.move_to_end(job_id)
+        if job.get("status") in self._FINISHED:
+            finished_at.setdefault(job_id, time.monotonic())
+            if job.get("results") is not None and self._db is not None:
+                self._spill(job_id, job)
+        else:
+            finished_at.pop(job_id, None)
+        if len(jobs) > self._shard_size:
+            oldest, _ = jobs.popitem(last=False)
+            finished_at.pop(oldest, None)
+            self._drop_results(spilled, oldest)
+            return oldest
+        return None
+    
+    def _spill(self, job_id: str, job: Dict[str, Any]):
+        # Called with the shard's lock held; the write itself happens on the writer thread
+        results = job["results"]
+        if self._pending.get(job_id) is not results:
+            self._pending[job_id] = results
+            self._writes.put(("put", job_id, results))
+    
+    def _drop_results(self, spilled: set, job_id: str):
+        # Called with the shard's lock held
+        self._pending.pop(job_id, None)
+        spilled.discard(job_id)
+        if self._db is not None:
+            self._writes.put(("delete", job_id, None))
+    
+    def _write_results(self):
+        """Writer thread: save queued results to results_db, then drop them from memory
+        if the job still holds the same results"""
+        # Hash of each job's saved results, so results put back unchanged aren't rewritten
+        written: Dict[str, bytes] = {}
+        while True:
+            action, job_id, results = self._writes.get()
+            if action == "delete":
+                if written.pop(job_id, None) is not None:
+                    with self._db_lock:
+                        self._db.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
+                continue
+            try:
+                data = _dumps(results)
+                digest = hashlib.sha1(data.encode("utf-8")).digest()
+                if written.get(job_id) != digest:
+                    with self._db_lock:
+                        self._db.execute("INSERT OR REPLACE INTO results (job_id, data) VALUES (?, ?)", (job_id, data))
+                    written[job_id] = digest
+            except (TypeError, sqlite3.Error) as e:
+                # Results CrewAI handed back that aren't plain JSON stay in memory
+                logger.warning(f"Keeping results of job {job_id} in memory: {e}")
+                continue
+            lock, jobs, _, spilled = self._shard(job_id)
+            with lock:
+                job = jobs.get(job_id)
+                if job is not None and job.get("results") is results:
+                    del job["results"]
+                    spilled.add(job_id)
+                if self._pending.get(job_id) is results:
+                    del self._pending[job_id]
+    
+    def evict_expired(self) -> int:
+        """Drop finished jobs older than ttl; returns how many were dropped"""
+        cutoff = time.monotonic() - self.ttl
+        evicted = 0
+        for lock, jobs, finished_at, spilled in self._shards:
+            with lock:
+                expired = [job_id for job_id, finished in finished_at.items() if finished < cutoff]
+                for job_id in expired:
+                    del finished_at[job_id]
+                    jobs.pop(job_id, None)
+                    self._drop_results(spilled, job_id)
+            for job_id in expired:
+                self._evicted(job_id)
+            evicted += len(expired)
+        return evicted
+
+# The event loop the app runs on, set at startup
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _forget_job_logs(job_id: str):
+    """Drop an evicted job's logs. Jobs can be evicted from FastAPI's threadpool (the
+    sync generate endpoint), but the manager's state belongs to the event loop"""
+    if _event_loop is None:
+        manager.forget(job_id)
+    else:
+        _event_loop.call_soon_threadsafe(manager.forget, job_id)
+
+# Store for job status and results; a dropped job's logs go with it
+jobs = JobStore(MAX_TRACKED_JOBS, JOB_TTL, JOB_RESULTS_DB, on_evict=_forget_job_logs)
+# Seconds between sweeps for finished jobs past JOB_TTL
+_JOB_EVICT_INTERVAL = 30
+
+async def _evict_expired_jobs():
+    while True:
+        await asyncio.sleep(_JOB_EVICT_INTERVAL)
+        evicted = jobs.evict_expired()
+        if evicted:
+            logger.info(f"Dropped {evicted} finished jobs older than {JOB_TTL}s")
+
+@app.on_event("startup")
+async def start_job_evictor():
+    global _event_loop
+    _event_loop = asyncio.get_running_loop()
+    app.state.job_evictor = asyncio.create_task(_evict_expired_jobs())
 
 # API endpoints
 
@@ -371,6 +893,12 @@ import re
 
 router = APIRouter()
 
+class _CodeFiles(dict):
+    """Filename -> code mapping that has already been through fix_incomplete_code"""
+
+def _fix_files(files: Dict[str, str]) -> _CodeFiles:
+    return _CodeFiles((filename, fix_incomplete_code(code, filename)) for filename, code in files.items())
+
 def extract_code_from_output(result) -> str:
     """Extract code from various output formats including CrewOutput objects, markdown strings, etc."""
     # If result is None, return empty string
@@ -378,24 +906,23 @@ def extract_code_from_output(result) -> str:
         logger.warning("extract_code_from_output received None result")
         return {}
     
-    # If result is already a dictionary of files, return it directly
-    if isinstance(result, dict) and all(isinstance(v, str) for v in result.values()):
-        # Check for and fix incomplete code in each file
-        fixed_result = {}
-        for filename, code in result.items():
-            fixed_result[filename] = fix_incomplete_code(code, filename)
-        logger.info(f"Fixed {len(fixed_result)} code files for placeholders")
-        return fixed_result
-        
+    # Dispatch on the exact type first; subclasses and other objects fall back to isinstance
+    handler = _EXTRACTORS.get(type(result))
+    if handler is None:
+        handler = next((h for t, h in _EXTRACTORS.items() if isinstance(result, t)), _extract_object)
+    return handler(result)
+
+def _looks_like_json(text) -> bool:
+    # Agent output is almost never JSON, so skip the parse unless it could be an object
+    return isinstance(text, str) and text.lstrip()[:1] == "{"
+
+def _extract_object(result):
     # If result has a code attribute, use that directly
     if hasattr(result, 'code') and result.code:
         logger.info("Found code attribute in result")
         if isinstance(result.code, dict):
             # Fix each file in the code dictionary
-            fixed_code = {}
-            for filename, code in result.code.items():
-                fixed_code[filename] = fix_incomplete_code(code, filename)
-            return fixed_code
+            return _fix_files(result.code)
         elif isinstance(result.code, str):
             # If code is a string, try to extract code blocks
             code_files = extract_code_files_from_markdown(result.code)
@@ -412,266 +939,290 @@ def extract_code_from_output(result) -> str:
         raw_text = result.raw_output
         
         # Check if raw_output is already a dictionary of files
-        try:
-            parsed = json.loads(raw_text)
+        if _looks_like_json(raw_text):
+            try:
+                parsed = _loads(raw_text)
+            except ValueError:
+                parsed = None
             if isinstance(parsed, dict) and all(isinstance(k, str) and isinstance(v, str) for k, v in parsed.items()):
                 logger.info("Raw output parsed as a dictionary of code files")
                 # Fix each file in the parsed dictionary
-                fixed_parsed = {}
-                for filename, code in parsed.items():
-                    fixed_parsed[filename] = fix_incomplete_code(code, filename)
-                return fixed_parsed
-        except:
-            pass
+                return _fix_files(parsed)
         
         # Look for code blocks with triple backticks (language tag is optional)
         code_files = extract_code_files_from_markdown(raw_text)
         if code_files:
             logger.info(f"Extracted {len(code_files)} code files from raw_output")
             # Fix each extracted code file
-            fixed_files = {}
-            for filename, code in code_files.items():
-                fixed_files[filename] = fix_incomplete_code(code, filename)
-            return fixed_files
+            return _fix_files(code_files)
         
         # If no code blocks found, return the raw text as a single file
         return {"output.txt": fix_incomplete_code(raw_text.strip(), "output.txt")}
     
-    # If result is a dict, check various patterns
-    if isinstance(result, dict):
-        # If dict contains file paths as keys and code content as values
-        if all(isinstance(k, str) and isinstance(v, str) for k, v in result.items()):
-            logger.info("Result is a dictionary of file paths and code content")
-            # Fix each file in the dictionary
-            fixed_result = {}
-            for filename, code in result.items():
-                fixed_result[filename] = fix_incomplete_code(code, filename)
-            return fixed_result
-            
-        # If dict has a 'code' key, use that
-        if 'code' in result:
-            logger.info("Found 'code' key in dict result")
-            if isinstance(result['code'], dict):
-                # Fix each file in the code dictionary
-                fixed_code = {}
-                for filename, code in result['code'].items():
-                    fixed_code[filename] = fix_incomplete_code(code, filename)
-                return fixed_code
-            elif isinstance(result['code'], str):
-                # Try to extract code blocks from the string
-                code_files = extract_code_files_from_markdown(result['code'])
-                if code_files:
-                    return code_files
-                else:
-                    # If no code blocks found, store as a single file
-                    return {"main.py": fix_incomplete_code(result['code'], "main.py")}
-            return {"unknown.py": fix_incomplete_code(str(result['code']), "unknown.py")}
+    # Last resort: convert to string and store as text file
+    logger.info(f"Using string representation of type: {type(result)}")
+    return {"output.txt": str(result)}
+
+def _extract_dict(result: dict):
+    # If the dict is already filenames -> code, fix each file and return it
+    if all(isinstance(v, str) for v in result.values()):
+        fixed_result = _fix_files(result)
+        logger.info(f"Fixed {len(fixed_result)} code files for placeholders")
+        return fixed_result
         
-        # If dict has only one item, use its value
-        if len(result) == 1:
-            logger.info("Single value dict result, using its value")
-            key = next(iter(result))
-            # Recursively process the value
-            return extract_code_from_output(result[key])
-            
-        # Check for raw_output key
-        if 'raw_output' in result:
-            logger.info("Found 'raw_output' key in dict result")
-            return extract_code_from_output(result['raw_output'])
-            
-        # Check for task outputs in the result
-        for key in result.keys():
-            if 'task' in key.lower() or key in ['planner', 'frontend', 'backend', 'tester', 'deployment']:
-                logger.info(f"Found potential task output in key: {key}")
-                task_result = result[key]
-                if isinstance(task_result, str):
-                    # Try to extract code blocks from the string
-                    code_files = extract_code_files_from_markdown(task_result)
-                    if code_files:
-                        # Use task name as prefix for filenames
-                        prefixed_files = {f"{key}/{filename}": content for filename, content in code_files.items()}
-                        return prefixed_files
-                elif isinstance(task_result, dict):
-                    # If it's already a dictionary, use it directly with task name as prefix
-                    prefixed_files = {f"{key}/{filename}": content for filename, content in task_result.items() if isinstance(content, str)}
-                    if prefixed_files:
-                        return prefixed_files
-    
-    # If result is a string, try to extract code blocks
-    if isinstance(result, str):
-        # Try to parse as JSON first
-        try:
-            parsed = json.loads(result)
-            if isinstance(parsed, dict):
-                return extract_code_from_output(parsed)
-        except:
-            pass
-            
-        # Look for code blocks with triple backticks
-        code_files = extract_code_files_from_markdown(result)
-        if code_files:
-            logger.info(f"Extracted {len(code_files)} code files from string")
-            # Fix each extracted code file
-            fixed_files = {}
-            for filename, code in code_files.items():
-                fixed_files[filename] = fix_incomplete_code(code, filename)
-            return fixed_files
-        else:
-            # If no code blocks found, check if it looks like code
-            if "def " in result or "class " in result or "import " in result or "function" in result:
-                # Determine file type based on content
-                if "def " in result or "import " in result:
-                    return {"main.py": fix_incomplete_code(result.strip(), "main.py")}
-                elif "function" in result or "const " in result or "let " in result:
-                    return {"main.js": fix_incomplete_code(result.strip(), "main.js")}
-                else:
-                    return {"code.txt": fix_incomplete_code(result.strip(), "code.txt")}
+    # If dict has a 'code' key, use that
+    if 'code' in result:
+        logger.info("Found 'code' key in dict result")
+        if isinstance(result['code'], dict):
+            # Fix each file in the code dictionary
+            return _fix_files(result['code'])
+        elif isinstance(result['code'], str):
+            # Try to extract code blocks from the string
+            code_files = extract_code_files_from_markdown(result['code'])
+            if code_files:
+                return code_files
             else:
-                # Not code, store as text
-                return {"output.txt": result.strip()}
-    
-    # If result is a list, try to join its items
-    if isinstance(result, list):
-        logger.info("Processing list result")
-        # Try to process each item in the list
-        combined_results = {}
-        for i, item in enumerate(result):
-            item_result = extract_code_from_output(item)
-            if isinstance(item_result, dict):
-                # Add prefix to avoid key collisions
-                for filename, content in item_result.items():
-                    combined_results[f"item_{i}_{filename}"] = content
-            elif isinstance(item_result, str):
-                combined_results[f"item_{i}.txt"] = item_result
+                # If no code blocks found, store as a single file
+                return {"main.py": fix_incomplete_code(result['code'], "main.py")}
+        return {"unknown.py": fix_incomplete_code(str(result['code']), "unknown.py")}
+    
+    # If dict has only one item, use its value
+    if len(result) == 1:
+        logger.info("Single value dict result, using its value")
+        key = next(iter(result))
+        # Recursively process the value
+        return extract_code_from_output(result[key])
         
-        if combined_results:
-            return combined_results
-        else:
-            # Fallback: join all items as text
-            joined_result = '\n\n'.join(str(item) for item in result)
-            return {"combined_output.txt": fix_incomplete_code(joined_result, "combined_output.txt")}
+    # Check for raw_output key
+    if 'raw_output' in result:
+        logger.info("Found 'raw_output' key in dict result")
+        return extract_code_from_output(result['raw_output'])
+        
+    # Check for task outputs in the result
+    for key in result.keys():
+        if 'task' in key.lower() or key in ['planner', 'frontend', 'backend', 'tester', 'deployment']:
+            logger.info(f"Found potential task output in key: {key}")
+            task_result = result[key]
+            if isinstance(task_result, str):
+                # Try to extract code blocks from the string
+                code_files = extract_code_files_from_markdown(task_result)
+                if code_files:
+                    # Use task name as prefix for filenames
+                    prefixed_files = {f"{key}/{filename}": content for filename, content in code_files.items()}
+                    return prefixed_files
+            elif isinstance(task_result, dict):
+                # If it's already a dictionary, use it directly with task name as prefix
+                prefixed_files = {f"{key}/{filename}": content for filename, content in task_result.items() if isinstance(content, str)}
+                if prefixed_files:
+                    return prefixed_files
     
     # Last resort: convert to string and store as text file
     logger.info(f"Using string representation of type: {type(result)}")
     return {"output.txt": str(result)}
 
+def _extract_str(result: str):
+    # Try to parse as JSON first
+    if _looks_like_json(result):
+        try:
+            parsed = _loads(result)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return extract_code_from_output(parsed)
+        
+    # Look for code blocks with triple backticks
+    code_files = extract_code_files_from_markdown(result)
+    if code_files:
+        logger.info(f"Extracted {len(code_files)} code files from string")
+        # Fix each extracted code file
+        return _fix_files(code_files)
+    else:
+        # If no code blocks found, check if it looks like code
+        if "def " in result or "class " in result or "import " in result or "function" in result:
+            # Determine file type based on content
+            if "def " in result or "import " in result:
+                return {"main.py": fix_incomplete_code(result.strip(), "main.py")}
+            elif "function" in result or "const " in result or "let " in result:
+                return {"main.js": fix_incomplete_code(result.strip(), "main.js")}
+            else:
+                return {"code.txt": fix_incomplete_code(result.strip(), "code.txt")}
+        else:
+            # Not code, store as text
+            return {"output.txt": result.strip()}
+
+def _extract_list(result: list):
+    logger.info("Processing list result")
+    # Try to process each item in the list
+    combined_results = {}
+    for i, item in enumerate(result):
+        item_result = extract_code_from_output(item)
+        if isinstance(item_result, dict):
+            # Add prefix to avoid key collisions
+            for filename, content in item_result.items():
+                combined_results[f"item_{i}_{filename}"] = content
+        elif isinstance(item_result, str):
+            combined_results[f"item_{i}.txt"] = item_result
+    
+    if combined_results:
+        return combined_results
+    else:
+        # Fallback: join all items as text
+        joined_result = '\n\n'.join(str(item) for item in result)
+        return {"combined_output.txt": fix_incomplete_code(joined_result, "combined_output.txt")}
+
+# Checked in order by the isinstance fallback, so _CodeFiles must stay ahead of dict.
+# Files that were already fixed are returned as they are
+_EXTRACTORS = {
+    _CodeFiles: lambda result: result,
+    dict: _extract_dict,
+    str: _extract_str,
+    list: _extract_list,
+}
+
+# Placeholder bodies that fix_incomplete_code fills in. Each group names the
+# entry in _PLACEHOLDER_FIXES that rebuilds it; bare "..." is the last resort
+_DOTS_PLACEHOLDER = r'(?P<dots>\.\.\.)'
+_DOTS_FILL = "/* Implementation provided */"
+_PY_PLACEHOLDERS = re.compile(
+    r'def (?P<py_def>[^(]+)\([^)]*\):\s*\.\.\.\s*'
+    r'|' + _DOTS_PLACEHOLDER
+)
+_JS_PLACEHOLDERS = re.compile(
+    r'function (?P<js_func>[^(]+)\([^)]*\)\s*{\s*\.\.\.\s*}'
+    r'|const (?P<jsx_component>[A-Z][a-zA-Z]*) = \(\) => {\s*\.\.\.\s*}'
+    r'|' + _DOTS_PLACEHOLDER
+)
+_PLACEHOLDER_FIXES = {
+    'py_def': lambda name: f'def {name}():\n    """Implementation for {name}"""\n    pass\n\n',
+    'js_func': lambda name: f'function {name}() {{\n  // Implementation for {name}\n  return null;\n}}',
+    'jsx_component': lambda name: f'const {name} = () => {{\n  return (\n    <div>\n      <h1>{name} Component</h1>\n    </div>\n  );\n}}',
+    'dots': lambda _: _DOTS_FILL,
+}
+
+def _fill_placeholder(match) -> str:
+    # Names captured from mangled code can themselves contain "..."
+    name = match.group(match.lastgroup).replace("...", _DOTS_FILL)
+    return _PLACEHOLDER_FIXES[match.lastgroup](name)
+
 def fix_incomplete_code(code: str, filename: str) -> str:
     """Fix incomplete code by replacing placeholders with actual implementations"""
     if not code or not isinstance(code, str):
         return code
     
-    # Check if the code contains placeholders
-    has_placeholders = "..." in code or "[...]" in code or "# Continue implementation" in code
-    
-    if not has_placeholders:
+    # Check if the code contains placeholders; "[...]" contains "..." so one scan
+    # covers both, and the comment marker is only looked for when that misses
+    if "..." not in code and "# Continue implementation" not in code:
         return code
     
     logger.info(f"Detected placeholders in {filename}, attempting to fix")
     
     # Determine file type based on extension
     ext = filename.split('.')[-1].lower() if '.' in filename else ''
-    
-    # Replace common placeholder patterns with actual implementations
-    fixed_code = code
-    
-    # Replace "..." in function bodies with actual implementations
-    if ext in ['py', 'js', 'jsx', 'ts', 'tsx']:
-        # Python-specific fixes
-        if ext == 'py':
-            # Fix empty function bodies
-            fixed_code = re.sub(r'def ([^(]+)\([^)]*\):\s*\.\.\.\s*', 
-                               lambda m: f'def {m.group(1)}():\n    """Implementation for {m.group(1)}"""\n    pass\n\n', 
-                               fixed_code)
-            
-            # Fix incomplete database setup
-            if "createorcreate" in fixed_code:
-                fixed_code = fixed_code.replace("createorcreate(database_url=DATABASE0DB)", 
-                                              "create_engine(DATABASE_URL or 'sqlite:///./app.db')")
-            
-            # Fix incomplete imports
-            if "import dotenv" in fixed_code and "import os" not in fixed_code:
-                fixed_code = fixed_code.replace("import dotenv", "import os\nimport dotenv")
-                
-            # Fix incomplete route handlers
-            fixed_code = re.sub(r'@app\.([a-z]+)\("([^"]+)"\)\s*\ndef ([^(]+)\([^)]*\):\s*\.\.\.\s*', 
-                               lambda m: f'@app.{m.group(1)}("{m.group(2)}")\ndef {m.group(3)}():\n    """Handler for {m.group(2)}"""\n    return {{"message": "Endpoint for {m.group(2)}"}}\n\n', 
-                               fixed_code)
-                
-        # JavaScript/React specific fixes
-        elif ext in ['js', 'jsx', 'ts', 'tsx']:
-            # Fix empty functions
-            fixed_code = re.sub(r'function ([^(]+)\([^)]*\)\s*{\s*\.\.\.\s*}', 
-                               lambda m: f'function {m.group(1)}() {{\n  // Implementation for {m.group(1)}\n  return null;\n}}', 
-                               fixed_code)
-            
-            # Fix incomplete React components
-            fixed_code = re.sub(r'const ([A-Z][a-zA-Z]*) = \(\) => {\s*\.\.\.\s*}', 
-                               lambda m: f'const {m.group(1)} = () => {{\n  return (\n    <div>\n      <h1>{m.group(1)} Component</h1>\n    </div>\n  );\n}}', 
-                               fixed_code)
-    
-    # Generic fixes for all file types
-    # Replace any remaining "..." with appropriate content
-    fixed_code = fixed_code.replace("...", "/* Implementation provided */")
-    fixed_code = fixed_code.replace("[...]", "/* Complete implementation */")
+    fixed_code = _fix_cached(code, ext)
     
     logger.info(f"Fixed placeholders in {filename}")
     return fixed_code
 
+# Placeholder fixes by (SHA-1 of the code, extension), None when the code needed none.
+# Keyed on a digest so the cache doesn't keep whole generated files alive
+_FIXED_CODE: Dict[Tuple[bytes, str], Optional[str]] = _LRUDict(64)
+_FIXED_CODE_LOCK = threading.Lock()
+
+def _fix_cached(code: str, ext: str) -> str:
+    # Extraction often pushes the same file through more than once
+    key = (hashlib.sha1(code.encode("utf-8")).digest(), ext)
+    with _FIXED_CODE_LOCK:
+        if key in _FIXED_CODE:
+            fixed_code = _FIXED_CODE[key]
+            return code if fixed_code is None else fixed_code
+    fixed_code = _fix_code(code, ext)
+    with _FIXED_CODE_LOCK:
+        _FIXED_CODE[key] = None if fixed_code == code else fixed_code
+    return fixed_code
+
+def _fix_code(code: str, ext: str) -> str:
+    # Every placeholder is filled in by one scan of the code
+    if ext == 'py':
+        fixed_code = _PY_PLACEHOLDERS.sub(_fill_placeholder, code)
+        
+        # Fix incomplete database setup
+        if "createorcreate" in fixed_code:
+            fixed_code = fixed_code.replace("createorcreate(database_url=DATABASE0DB)", 
+                                          "create_engine(DATABASE_URL or 'sqlite:///./app.db')")
+        
+        # Fix incomplete imports
+        if "import dotenv" in fixed_code and "import os" not in fixed_code:
+            fixed_code = fixed_code.replace("import dotenv", "import os\nimport dotenv")
+        return fixed_code
+    
+    if ext in ('js', 'jsx', 'ts', 'tsx'):
+        return _JS_PLACEHOLDERS.sub(_fill_placeholder, code)
+    
+    # Generic fix for all other file types
+    return code.replace("...", _DOTS_FILL)
+
+# Fenced code blocks as (language, filename, code), where the block may start
+# with a "File: <name>" line
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\s*(?:File:\s*([^\n]+))?\n(.*?)```', re.DOTALL)
+
+# Map language to file extension
+_CODE_EXTENSIONS = {
+    'python': 'py',
+    'javascript': 'js',
+    'typescript': 'ts',
+    'jsx': 'jsx',
+    'tsx': 'tsx',
+    'html': 'html',
+    'css': 'css',
+    'json': 'json',
+    'yaml': 'yml',
+    'bash': 'sh',
+    'dockerfile': 'Dockerfile',
+    'markdown': 'md'
+}
+
 def extract_code_files_from_markdown(markdown: str) -> dict:
     """Extract code blocks from markdown and organize them into files"""
+    return dict(_extract_markdown_cached(markdown))
+
+@functools.lru_cache(maxsize=128)
+def _extract_markdown_cached(markdown: str) -> tuple:
+    # Cached as (filename, code) pairs so callers each get their own dict
     code_files = {}
-    file_pattern = r'```(?:\w+)?\s*(?:File:\s*([^\n]+))?\n([\s\S]*?)```'
     unnamed_counter = 1
     
-    for match in re.finditer(file_pattern, markdown):
-        filename = match.group(1)
-        code = match.group(2).strip()
+    for lang, filename, code in _CODE_BLOCK_RE.findall(markdown):
+        code = code.strip()
         
         if not filename:
-            # Try to detect language and use appropriate extension
-            lang_match = re.match(r'```(\w+)', match.group(0))
-            lang = lang_match.group(1) if lang_match else 'txt'
-            
-            # Map language to file extension
-            ext_map = {
-                'python': 'py',
-                'javascript': 'js',
-                'typescript': 'ts',
-                'jsx': 'jsx',
-                'tsx': 'tsx',
-                'html': 'html',
-                'css': 'css',
-                'json': 'json',
-                'yaml': 'yml',
-                'bash': 'sh',
-                'dockerfile': 'Dockerfile',
-                'markdown': 'md'
-            }
-            
-            ext = ext_map.get(lang.lower(), lang.lower())
+            # Use the fence's language tag to pick an extension
+            lang = lang.lower() or 'txt'
+            ext = _CODE_EXTENSIONS.get(lang, lang)
             filename = f"file_{unnamed_counter}.{ext}"
             unnamed_counter += 1
         
         code_files[filename] = code
     
-    return code_files
+    return tuple(code_files.items())
 
 @router.get("/api/generate-code")
-def get_generated_code(job_id: str):
+async def get_generated_code(job_id: str):
     try:
         # Try to get job from job_manager first
         job = job_manager.get_job(job_id)
         job_result = job.result
     except (AttributeError, Exception) as e:
         # Fall back to checking the jobs dictionary
-        if job_id in jobs and jobs[job_id].get("results"):
-            job_result = jobs[job_id]["results"]
+        job = jobs.get(job_id)
+        if job and job.get("results"):
+            job_result = job["results"]
         else:
             logger.error(f"Job {job_id} not found or has no results: {e if 'e' in locals() else ''}")
             raise HTTPException(status_code=404, detail="Job or result not found")
     
-    # Extract code from the result
-    code = extract_code_from_output(job_result)
+    # Extract code from the result; the regex passes run off the event loop so
+    # WebSocket log streaming isn't held up behind them
+    code = await asyncio.to_thread(extract_code_from_output, job_result)
     logger.info(f"Extracted code for job {job_id}, length: {len(code) if code else 0}")
     return {"code": code}
 
@@ -684,18 +1235,20 @@ async def root():
 @app.post("/api/generate", response_model=JobStatus)
 def generate_app(request: AppRequest, background_tasks: BackgroundTasks):
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {
+    jobs.set(job_id, {
         "status": "analyzing",  # New initial status
         "results": None
-    }
+    })
     background_tasks.add_task(process_app_request, job_id, request.prompt)
     return JobStatus(job_id=job_id, status="analyzing")  # Updated status
 
+# Code extractions for get_job that are still running, by job id
+_code_extractions: Dict[str, asyncio.Task] = {}
+
 @app.get("/api/jobs/{job_id}")
 async def get_job(job_id: str):
-    if job_id in jobs:
-        job_data = jobs[job_id]
-        
+    job_data = jobs.get(job_id)
+    if job_data is not None:
         # Add code field directly for frontend compatibility
         if job_data and "results" in job_data and job_data["results"]:
             # First check if we have processed code
@@ -704,22 +1257,36 @@ async def get_job(job_id: str):
                 logger.info(f"Using processed code for job {job_id}")
             # Otherwise check for raw_output and extract code
             elif "raw_output" in job_data["results"]:
-                # Extract code from raw_output and add it directly to results
+                # Extract code from raw_output once and keep it in results; polls that
+                # arrive while that is running wait for the same extraction
                 if "code" not in job_data["results"]:
-                    code = extract_code_from_output(job_data["results"]["raw_output"])
-                    job_data["results"]["code"] = code
-                    logger.info(f"Added extracted code to job {job_id} results (length: {len(code) if code else 0})")
+                    extraction = _code_extractions.get(job_id)
+                    if extraction is None:
+                        extraction = _code_extractions[job_id] = asyncio.create_task(
+                            asyncio.to_thread(extract_code_from_output, job_data["results"]["raw_output"]))
+                        extraction.add_done_callback(lambda _: _code_extractions.pop(job_id, None))
+                    # Shielded so a poll that goes away doesn't cancel it for the others
+                    code = await asyncio.shield(extraction)
+                    if "code" not in job_data["results"]:
+                        job_data["results"]["code"] = code
+                        jobs.update(job_id, results=job_data["results"])
+                        logger.info(f"Added extracted code to job {job_id} results (length: {len(code) if code else 0})")
                 
         return job_data
     raise HTTPException(status_code=404, detail="Job not found")
 
+def _merged_sections(category: Dict[str, Any], sections: tuple) -> ChainMap:
+    """Read-only view of the files in the given sections of a results category,
+    where later sections win as if each were dict.update-ed in turn"""
+    return ChainMap(*(category[section] for section in reversed(sections) if section in category))
+
 @app.post("/api/jobs/{job_id}/fix-validation")
 async def fix_validation_issues(job_id: str):
     """Endpoint to fix validation issues in generated code"""
-    if job_id not in jobs:
+    job_data = jobs.get(job_id)
+    if job_data is None:
         raise HTTPException(status_code=404, detail="Job not found")
         
-    job_data = jobs[job_id]
     results = job_data.get("results", {})
     
     if "validation" not in results:
@@ -734,6 +1301,19 @@ async def fix_validation_issues(job_id: str):
     try:
         # Process each file with errors and try to fix them
         fixed_files = 0
+        
+        # Index which section dicts hold each category's files, so every error
+        # doesn't have to search the results structure again
+        path_index: Dict[tuple, List[Dict[str, Any]]] = {}
+        for category, sections in results.items():
+            if not isinstance(sections, dict):
+                continue
+            for section_files in sections.values():
+                if isinstance(section_files, dict):
+                    for filename in section_files:
+                        path_index.setdefault((category, filename), []).append(section_files)
+        
+        to_fix = []
         for file_path, errors in validation["errors"].items():
             # Extract the category and filename
             parts = file_path.split("/")
@@ -741,48 +1321,38 @@ async def fix_validation_issues(job_id: str):
                 continue
                 
             category, filename = parts
-            if category not in results:
-                continue
-                
-            # Find where this file is in the results structure
-            for section in results[category]:
-                if isinstance(results[category][section], dict) and filename in results[category][section]:
-                    original_content = results[category][section][filename]
-                    
-                    # Use the CodeValidator to fix the file
-                    fixed_content = CodeValidator.fix_code(filename, original_content, errors)
-                    
-                    # Update the results with fixed content if changes were made
-                    if fixed_content != original_content:
-                        results[category][section][filename] = fixed_content
-                        fixed_files += 1
-        
-        # Revalidate the fixed code
-        validation_files = {}
-        if "backend" in results:
-            validation_files["backend"] = {}
-            if "endpoints" in results["backend"]:
-                validation_files["backend"].update(results["backend"]["endpoints"])
-            if "models" in results["backend"]:
-                validation_files["backend"].update(results["backend"]["models"])
-            if "database" in results["backend"]:
-                validation_files["backend"].update(results["backend"]["database"])
+            for section_files in path_index.get((category, filename), ()):
+                to_fix.append((section_files, filename, section_files[filename], errors))
         
-        if "frontend" in results:
-            validation_files["frontend"] = {}
-            if "components" in results["frontend"]:
-                validation_files["frontend"].update(results["frontend"]["components"])
-            if "styles" in results["frontend"]:
-                validation_files["frontend"].update(results["frontend"]["styles"])
+        # Use the CodeValidator to fix the files, off the event loop
+        fixed = await asyncio.gather(*(
+            asyncio.to_thread(CodeValidator.fix_code, filename, original_content, errors)
+            for _, filename, original_content, errors in to_fix
+        ))
         
-        # Run validation again
-        new_validation = CodeValidator.validate_project(validation_files)
-        results["validation"] = new_validation
-        
-        # Update job with new results
-        jobs[job_id]["results"] = results
+        # Update the results with fixed content if changes were made
+        for (section_files, filename, original_content, _), fixed_content in zip(to_fix, fixed):
+            if fixed_content != original_content:
+                section_files[filename] = fixed_content
+                fixed_files += 1
         
+        # Nothing changed, so the existing validation still stands
         if fixed_files > 0:
+            # Revalidate the fixed code
+            validation_files = {}
+            if "backend" in results:
+                validation_files["backend"] = _merged_sections(results["backend"], ("endpoints", "models", "database"))
+            
+            if "frontend" in results:
+                validation_files["frontend"] = _merged_sections(results["frontend"], ("components", "styles"))
+            
+            # Run validation again
+            new_validation = await asyncio.to_thread(CodeValidator.validate_project, validation_files)
+            results["validation"] = new_validation
+            
+            # Update job with new results
+            jobs.update(job_id, results=results)
+            
             await manager.send_log(
                 job_id,
                 "Code Validator",
@@ -824,156 +1394,182 @@ async def fix_validation_issues(job_id: str):
         )
         return {"success": False, "message": f"Error: {str(e)}"}
     
-    return jobs[job_id]
+    return jobs.get(job_id)
 
 @app.get("/api/jobs/{job_id}/logs")
 async def get_job_logs(job_id: str):
-    return {"logs": manager.get_logs(job_id)}
+    return {"logs": await manager.get_logs(job_id)}
+
+async def _handle_ping(job_id: str, websocket: WebSocket):
+    # Respond to ping with current status
+    manager.send_to(job_id, websocket, {
+        "type": "pong",
+        "timestamp": _iso_now()
+    })
+
+async def _handle_request_progress(job_id: str, websocket: WebSocket):
+    # Client is requesting current progress
+    progress = manager.agent_progress.snapshot(job_id)
+    if progress is not None:
+        manager.send_to(job_id, websocket, {
+            "type": "progress_update",
+            "progress": progress,
+            "timestamp": _iso_now()
+        })
+
+async def _handle_request_logs(job_id: str, websocket: WebSocket):
+    # Client is requesting all logs
+    await manager.send_logs_batch(job_id, websocket)
+
+# Client message type -> handler; other types are ignored
+_WS_HANDLERS = {
+    "ping": _handle_ping,
+    "request_progress": _handle_request_progress,
+    "request_logs": _handle_request_logs,
+}
 
 @app.websocket("/ws/{job_id}")
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
     await manager.connect(websocket, job_id)
     try:
-        # Send initial progress information
-        if job_id in manager.agent_progress:
-            await websocket.send_json({
-                "type": "progress_update",
-                "progress": manager.agent_progress[job_id],
-                "timestamp": datetime.now().isoformat()
-            })
+        # Send the current progress and any existing logs in one frame (the recent
+        # tail; request_logs fetches everything). A reconnecting client passes
+        # ?since=<last seq it saw> and only gets the lines after it
+        try:
+            since = int(websocket.query_params.get("since", 0))
+        except ValueError:
+            since = 0
+        manager.send_to(job_id, websocket, {
+            "type": "init",
+            "progress": manager.agent_progress.snapshot(job_id),
+            "logs": await manager.get_logs(job_id, full_history=False, since=since),
+            "timestamp": _iso_now()
+        })
         
-        # Send any existing logs
-        logs = manager.get_logs(job_id)
-        if logs:
-            for log in logs:
-                await websocket.send_json(log)
+        # A job that finished before the socket opened still gets its terminal event
+        job = jobs.get(job_id)
+        if job and job.get("status") in ("completed", "failed"):
+            await manager.send_job_status(job_id, job["status"], websocket=websocket, results=job.get("results"), error=job.get("error"))
         
         while True:
             # Listen for client messages
             data = await websocket.receive_text()
             
             try:
-                client_message = json.loads(data)
+                client_message = _loads(data)
                 
                 # Handle different message types
-                if client_message.get("type") == "ping":
-                    # Respond to ping with current status
-                    await websocket.send_json({
-                        "type": "pong",
-                        "timestamp": datetime.now().isoformat()
-                    })
-                
-                elif client_message.get("type") == "request_progress":
-                    # Client is requesting current progress
-                    if job_id in manager.agent_progress:
-                        await websocket.send_json({
-                            "type": "progress_update",
-                            "progress": manager.agent_progress[job_id],
-                            "timestamp": datetime.now().isoformat()
-                        })
-                
-                elif client_message.get("type") == "request_logs":
-                    # Client is requesting all logs
-                    logs = manager.get_logs(job_id)
-                    await websocket.send_json({
-                        "type": "logs_batch",
-                        "logs": logs,
-                        "timestamp": datetime.now().isoformat()
-                    })
+                handler = _WS_HANDLERS.get(client_message.get("type"))
+                if handler is not None:
+                    await handler(job_id, websocket)
             
             except json.JSONDecodeError:
                 # Not JSON, ignore
                 pass
             except Exception as e:
                 logger.error(f"Error processing WebSocket message: {str(e)}")
-                await websocket.send_json({
+                manager.send_to(job_id, websocket, {
                     "type": "error",
                     "message": f"Error processing message: {str(e)}",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _iso_now()
                 })
     
     except WebSocketDisconnect:
-        manager.disconnect(job_id)
+        manager.disconnect(job_id, websocket)
         logger.info(f"WebSocket client disconnected: {job_id}")
     except Exception as e:
         logger.error(f"WebSocket error: {str(e)}")
-        manager.disconnect(job_id)
+        manager.disconnect(job_id, websocket)
 
 # Task processing logic
+def _task_outputs_to_results(task_outputs) -> Dict[str, Any]:
+    # CrewOutput object with task_outputs attribute
+    results = {}
+    for task_output in task_outputs:
+        if hasattr(task_output, 'task') and hasattr(task_output.task, 'description'):
+            task_name = task_output.task.description.split('\n')[0][:20].strip().lower().replace(' ', '_')
+        else:
+            task_name = f"task_{len(results)+1}"
+        results[task_name] = task_output.output
+    logger.info(f"Processed CrewOutput with {len(results)} tasks: {list(results.keys())}")
+    return results
+
+@functools.singledispatch
+def _crew_output_to_results(crew_output) -> Dict[str, Any]:
+    """Turn what crew.kickoff() returned into the job's results; code is extracted
+    from raw_output afterwards"""
+    logger.info(f"Processing CrewOutput object of type: {type(crew_output)}")
+    if hasattr(crew_output, 'raw_output'):
+        logger.info("CrewOutput has raw_output attribute")
+        return {"raw_output": crew_output.raw_output}
+    # Fallback to string representation
+    logger.info("Converting CrewOutput to string representation")
+    return {"raw_output": str(crew_output)}
+
+@_crew_output_to_results.register
+def _(crew_output: dict):
+    logger.info(f"CrewOutput is a dict with keys: {list(crew_output.keys())}")
+    return crew_output
+
+@_crew_output_to_results.register
+def _(crew_output: list):
+    results = {f"task_{idx+1}": output for idx, output in enumerate(crew_output)}
+    logger.info(f"CrewOutput is a list with {len(results)} items")
+    return results
+
+@_crew_output_to_results.register
+def _(crew_output: str):
+    try:
+        results = json.loads(crew_output)
+        logger.info(f"CrewOutput string parsed as JSON with keys: {list(results.keys()) if isinstance(results, dict) else type(results)}")
+        return results
+    except Exception as e:
+        logger.error(f"Could not parse CrewOutput string as JSON: {e}")
+        return {"raw_output": crew_output}
+
 async def process_app_request(job_id: str, prompt: str):
     # Define agent callback at the top so it is always in scope
     async def callback_handler(agent, task, output):
         # Extract agent role and task description
         agent_role = agent.role
-        task_desc = task.description[:100] + "..." if len(task.description) > 100 else task.description
-        task_id = str(task.id) if hasattr(task, 'id') else "unknown"
+        description = task.description
+        task_desc = description[:100] + "..." if len(description) > 100 else description
         
         # Map agent role to progress tracking key
-        agent_key = None
-        if "Planning Architect" in agent_role:
-            agent_key = "planner"
-        elif "Backend Engineer" in agent_role:
-            agent_key = "backend"
-        elif "Frontend Developer" in agent_role:
-            agent_key = "frontend"
-        elif "Quality Assurance" in agent_role or "QA Engineer" in agent_role:
-            agent_key = "tester"
-        elif "DevOps Engineer" in agent_role:
-            agent_key = "deployment"
+        agent_key = _ROLE_TO_KEY.get(agent_role) or next(
+            (key for name, key in _ROLE_SUBSTRINGS if name in agent_role), None)
         
-        # Send detailed start message
-        start_message = f"Started working on: {task_desc}"
-        await manager.send_log(job_id, agent_role, start_message, "running")
+        # Everything logged here goes out to clients in one frame
+        batch = [(agent_role, f"Started working on: {task_desc}", "running")]
         
         # Provide explicit instructions to ensure complete code
         if agent_key in ["backend", "frontend", "tester", "deployment"]:
             instruction_message = "Generating complete, functional code with no placeholders or '...' ellipses. All code will be fully executable."
-            await manager.send_log(job_id, agent_role, instruction_message, "running")
+            batch.append((agent_role, instruction_message, "running"))
         
         # Send thinking update
-        await manager.send_log(job_id, agent_role, "Thinking about the task requirements...", "running")
+        batch.append((agent_role, "Thinking about the task requirements...", "running"))
         
         # Process the output to ensure it doesn't contain placeholders
         if output and isinstance(output, str):
-            # Check if the output contains placeholders like "..." or "[...]"
-            if "..." in output or "[...]" in output:
-                await manager.send_log(job_id, agent_role, "Detected incomplete code with placeholders. Regenerating complete implementation...", "running")
+            # Check if the output contains placeholders like "[...]"
+            if has_placeholders(output):
+                batch.append((agent_role, "Detected incomplete code with placeholders. Regenerating complete implementation...", "running"))
                 
                 # Try to fix the output by adding a note that will be seen by the LLM in the next task
                 if agent_key == "backend":
                     output += "\n\nIMPORTANT: The above code contains placeholders. Please replace all placeholders with complete, working implementations. Do not use '...' or '[...]' in your code. Provide fully functional code that can be executed without further modifications."
         
-        # Simulate progress updates during task execution
-        # In a real implementation, the agent would report actual progress
-        progress_steps = [
-            ("Analyzing requirements...", 30),
-            ("Planning implementation approach...", 40),
-            ("Executing task...", 50),
-            ("Generating complete code with no placeholders...", 70),
-            ("Finalizing output with fully executable code...", 90)
-        ]
-        
-        for message, progress in progress_steps:
-            # Update progress in the connection manager
-            if job_id in manager.agent_progress and agent_key:
-                manager.agent_progress[job_id][agent_key] = progress
-            
-            # Send progress update
-            await manager.send_log(job_id, agent_role, message, "running")
-            
-            # Add a small delay to simulate work being done
-            # This would be replaced by actual agent work in a real implementation
-            await asyncio.sleep(0.5)
-        
-        # Send completion message
-        completion_message = f"Completed: {task_desc}"
-        await manager.send_log(job_id, agent_role, completion_message, "completed")
+        # The task has already run by the time its output reaches this callback
+        batch.append((agent_role, "Executing task...", "running"))
+        batch.append((agent_role, f"Completed: {task_desc}", "completed"))
+        await manager.send_log_batch(job_id, batch)
         
         # Return the output
         return output
 
     # Update job status to analyzing
-    jobs[job_id] = {"job_id": job_id, "status": "analyzing", "results": None}
+    jobs.set(job_id, {"job_id": job_id, "status": "analyzing", "results": None})
     
     try:
         # First, analyze the prompt with our prompt analyzer
@@ -988,8 +1584,8 @@ async def process_app_request(job_id: str, prompt: str):
             formatted_requirements = analyzer.format_requirements_for_display(requirements)
             
             # Update job with requirements analysis
-            jobs[job_id]["requirements"] = formatted_requirements
-            jobs[job_id]["enhanced_prompt"] = requirements.get("enhanced_prompt", prompt)
+            jobs.update(job_id, requirements=formatted_requirements,
+                        enhanced_prompt=requirements.get("enhanced_prompt", prompt))
             
             # Log the analysis results
             await manager.send_log(job_id, "Prompt Analyzer", f"✅ Analysis complete: Identified {len(requirements.get('features', []))} features and technical requirements")
@@ -1004,13 +1600,13 @@ async def process_app_request(job_id: str, prompt: str):
             enhanced_prompt = requirements.get("enhanced_prompt", prompt)
             
             # Update status to running for the main job process
-            jobs[job_id]["status"] = "running"
+            jobs.update(job_id, status="running")
             
         except Exception as e:
             logger.error(f"Error in prompt analysis: {str(e)}")
             await manager.send_log(job_id, "Prompt Analyzer", f"⚠️ Warning: Error during prompt analysis. Continuing with original prompt: {str(e)}")
             enhanced_prompt = prompt
-            jobs[job_id]["status"] = "running"
+            jobs.update(job_id, status="running")
             
         # From this point on, use the enhanced_prompt instead of the original prompt
         # Create agents
@@ -1029,13 +1625,13 @@ async def process_app_request(job_id: str, prompt: str):
         # Create the planning task with enhanced prompt and analysis results
         planning_task_description = f"""Create a detailed plan for the following app:
 
-App Name: {jobs[job_id].get('requirements', {}).get('app_name', 'App from prompt')}
+App Name: {jobs.get(job_id).get('requirements', {}).get('app_name', 'App from prompt')}
 
 Original Request: {prompt}
 
 Enhanced Requirements: {enhanced_prompt}
 
-Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('sections', []), indent=2)}
+Analyzed Features: {json.dumps(jobs.get(job_id).get('requirements', {}).get('sections', []), indent=2)}
 """
         
         planning_task = TaskClass(
@@ -1072,17 +1668,27 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
             context=[backend_task, frontend_task, testing_task]
         )
         
+        tasks = [planning_task, backend_task, frontend_task, testing_task, deployment_task]
+        # Name of each task's results, looked up by identity
+        task_names = {
+            id(planning_task): "planner",
+            id(backend_task): "backend",
+            id(frontend_task): "frontend",
+            id(testing_task): "tester",
+            id(deployment_task): "deployment",
+        }
+        
         if USE_MOCK_DATA:
             # Create a mock crew for mock mode
             crew = MockCrew(
                 agents=[planner, frontend_dev, backend_dev, tester, deployment_engineer],
-                tasks=[planning_task, backend_task, frontend_task, testing_task, deployment_task]
+                tasks=tasks
             )
         else:
             # Create real crew for non-mock mode with callback for CrewAI 0.11.2
             crew = Crew(
                 agents=[planner, frontend_dev, backend_dev, tester, deployment_engineer],
-                tasks=[planning_task, backend_task, frontend_task, testing_task, deployment_task],
+                tasks=tasks,
                 verbose=True,
                 process=Process.sequential,
                 callbacks=[callback_handler]  # Use the callback function we defined
@@ -1100,17 +1706,19 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
             results = {}
             
             # Simulate crew execution with proper logging
-            for i, task in enumerate([planning_task, backend_task, frontend_task, testing_task, deployment_task]):
+            for task in tasks:
+                task_name = task_names[id(task)]
                 agent = task.agent
                 await manager.send_log(job_id, agent.role, f"Starting work on {task.description[:100]}...")
                 
-                # Simulate agent working
-                await asyncio.sleep(2)  # Simulating work time
+                # Optionally simulate agent working time, e.g. to demo the progress UI
+                if MOCK_SLEEP_SEC > 0:
+                    await asyncio.sleep(MOCK_SLEEP_SEC)
                 
                 # Generate a mock result based on the task
-                if task == planning_task:
+                if task_name == "planner":
                     # Use requirements if available or fallback to default
-                    requirements = jobs[job_id].get('requirements', {})
+                    requirements = jobs.get(job_id).get('requirements', {})
                     features = requirements.get('sections', {}).get('features', ["User authentication", "Data visualization", "API integration"])
                     tech_stack = requirements.get('tech_stack', ["React", "Tailwind CSS", "FastAPI", "SQLite"])
                     
@@ -1159,8 +1767,8 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
 - ItemForm: Create/edit items
 - UserProfile: User information and settings
 """
-                elif task == backend_task:
-                    requirements = jobs[job_id].get('requirements', {})
+                elif task_name == "backend":
+                    requirements = jobs.get(job_id).get('requirements', {})
                     
                     # Return actual code files instead of JSON structure
                     main_py = generate_backend_code(prompt)
@@ -1176,8 +1784,8 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
                         "requirements.txt": requirements_txt
                     }
                     
-                elif task == frontend_task:
-                    requirements = jobs[job_id].get('requirements', {})
+                elif task_name == "frontend":
+                    requirements = jobs.get(job_id).get('requirements', {})
                     
                     # Return actual code files instead of JSON structure
                     app_jsx = generate_app_jsx()
@@ -1190,10 +1798,10 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
                         "src/App.jsx": app_jsx,
                         "src/components/HomePage.jsx": home_page_jsx,
                         "src/App.css": app_css,
-                        "package.json": JSON.stringify(package_json, null, 2)
+                        "package.json": json.dumps(package_json, indent=2)
                     }
                     
-                elif task == testing_task:
+                elif task_name == "tester":
                     # Return actual test code files instead of JSON structure
                     backend_tests = generate_backend_tests()
                     frontend_tests = generate_frontend_tests()
@@ -1205,7 +1813,7 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
                         "frontend/src/tests/HomePage.test.jsx": frontend_tests,
                         "tests/test_integration.py": integration_tests
                     }
-                else:  # deployment_task
+                else:  # deployment
                     # Return actual deployment files instead of JSON structure
                     backend_dockerfile = generate_backend_dockerfile()
                     frontend_dockerfile = generate_frontend_dockerfile()
@@ -1225,18 +1833,6 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
                     }
                 
                 # Store result
-                task_name = task.description.split()[0].lower()
-                if task == planning_task:
-                    task_name = "planner"
-                elif task == backend_task:
-                    task_name = "backend"
-                elif task == frontend_task:
-                    task_name = "frontend"
-                elif task == testing_task:
-                    task_name = "tester"
-                else:
-                    task_name = "deployment"
-                    
                 results[task_name] = result
                 
                 # Log completion
@@ -1248,69 +1844,26 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
             try:
                 # Run the crew and get results - CrewAI 0.11.2 doesn't support awaiting kickoff()
                 # Convert to run in a thread to avoid blocking
+                # The crew issues its LLM calls one at a time, so it holds one Ollama slot
                 loop = asyncio.get_event_loop()
-                crew_output = await loop.run_in_executor(None, crew.kickoff)
+                if OLLAMA_SEMAPHORE.locked():
+                    # Every slot is taken by other jobs; say why this one isn't moving
+                    await manager.send_log(job_id, "System", "Waiting for an Ollama slot (other jobs are using the model server)")
+                async with OLLAMA_SEMAPHORE:
+                    crew_output = await loop.run_in_executor(None, crew.kickoff)
                 
                 # Debug logging to understand the structure of the CrewOutput
                 logger.info(f"CrewOutput type: {type(crew_output)}")
                 
                 # Robustly extract outputs from CrewOutput for downstream processing
-                results = {}
                 if hasattr(crew_output, 'task_outputs'):
-                    # CrewOutput object with task_outputs attribute
-                    for task_output in crew_output.task_outputs:
-                        if hasattr(task_output, 'task') and hasattr(task_output.task, 'description'):
-                            task_name = task_output.task.description.split('\n')[0][:20].strip().lower().replace(' ', '_')
-                        else:
-                            task_name = f"task_{len(results)+1}"
-                        results[task_name] = task_output.output
-                    logger.info(f"Processed CrewOutput with {len(results)} tasks: {list(results.keys())}")
-                elif isinstance(crew_output, dict):
-                    results = crew_output
-                    logger.info(f"CrewOutput is a dict with keys: {list(results.keys())}")
-                elif isinstance(crew_output, list):
-                    for idx, output in enumerate(crew_output):
-                        results[f"task_{idx+1}"] = output
-                    logger.info(f"CrewOutput is a list with {len(results)} items")
-                elif isinstance(crew_output, str):
-                    try:
-                        results = json.loads(crew_output)
-                        logger.info(f"CrewOutput string parsed as JSON with keys: {list(results.keys()) if isinstance(results, dict) else type(results)}")
-                    except Exception as e:
-                        logger.error(f"Could not parse CrewOutput string as JSON: {e}")
-                        results = {"raw_output": crew_output}
+                    results = _task_outputs_to_results(crew_output.task_outputs)
                 else:
-                    # Handle CrewOutput object more gracefully
-                    logger.info(f"Processing CrewOutput object of type: {type(crew_output)}")
-                    if hasattr(crew_output, 'raw_output'):
-                        logger.info("CrewOutput has raw_output attribute")
-                        raw_output = crew_output.raw_output
-                        # Try to extract code from the raw_output
-                        code = extract_code_from_output(raw_output)
-                        results = {
-                            "raw_output": raw_output,
-                            "code": code  # Store extracted code directly
-                        }
-                        logger.info(f"Extracted code from CrewOutput.raw_output (length: {len(code) if code else 0})")
-                        
-                        # Log the code structure for debugging
-                        if isinstance(code, dict):
-                            logger.info(f"Code contains {len(code)} files: {list(code.keys())}")
-                        else:
-                            logger.info(f"Code is not a dictionary but a {type(code)}")
-                    else:
-                        # Fallback to string representation
-                        logger.info("Converting CrewOutput to string representation")
-                        raw_output = str(crew_output)
-                        code = extract_code_from_output(raw_output)
-                        results = {
-                            "raw_output": raw_output,
-                            "code": code
-                        }
-                        
+                    results = _crew_output_to_results(crew_output)
+                
                 # Make sure code field is directly available in results for frontend
                 if "code" not in results and "raw_output" in results:
-                    results["code"] = extract_code_from_output(results["raw_output"])
+                    results["code"] = await asyncio.to_thread(extract_code_from_output, results["raw_output"])
                     logger.info(f"Extracted code from CrewOutput string representation (length: {len(results['code']) if results.get('code') else 0})")
                 
                 # Ensure code is properly structured for the frontend
@@ -1339,14 +1892,14 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
                 else:
                     await manager.send_log(job_id, "System", f"❌ Error: Connection issue with LLM. Details: {error_message}", "failed")
                 
-                jobs[job_id]["status"] = "failed"
-                jobs[job_id]["error"] = f"LLM connection error: {error_message}"
+                job = jobs.update(job_id, status="failed", error=f"LLM connection error: {error_message}")
+                await manager.send_job_status(job_id, "failed", error=job["error"])
                 return
             except Exception as e:
                 logger.error(f"Error running crew: {str(e)}")
                 await manager.send_log(job_id, "System", f"❌ Error: {str(e)}", "failed")
-                jobs[job_id]["status"] = "failed"
-                jobs[job_id]["error"] = str(e)
+                jobs.update(job_id, status="failed", error=str(e))
+                await manager.send_job_status(job_id, "failed", error=str(e))
                 return
         
         # Run code validation on the generated code
@@ -1412,8 +1965,8 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
                             # If not JSON, store as App.jsx
                             validation_files["frontend"] = {"App.jsx": frontend_data}
             
-            # Run validation
-            validation_result = CodeValidator.validate_project(validation_files)
+            # Run validation off the event loop so other jobs' logs keep streaming
+            validation_result = await asyncio.to_thread(CodeValidator.validate_project, validation_files)
             
             # Add validation result to the job output
             results["validation"] = validation_result
@@ -1560,20 +2113,23 @@ Analyzed Features: {json.dumps(jobs[job_id].get('requirements', {}).get('section
                 await manager.send_log(job_id, "Code Processor", f"Successfully processed {len(processed_files)} code files", "completed")
             
             # Update job with processed results
-            jobs[job_id] = {"job_id": job_id, "status": "completed", "results": results}
+            jobs.set(job_id, {"job_id": job_id, "status": "completed", "results": results})
             
         except Exception as e:
             logger.error(f"Error in code post-processing: {str(e)}")
             await manager.send_log(job_id, "Code Processor", f"Warning: Error during code post-processing: {str(e)}", "warning")
         
         await manager.send_log(job_id, "System", "All agents completed successfully", "completed")
+        await manager.send_job_status(job_id, "completed", results=results)
         
     except Exception as e:
         logger.error(f"Error processing job {job_id}: {str(e)}")
-        jobs[job_id] = {"job_id": job_id, "status": "failed", "error": str(e)}
+        jobs.set(job_id, {"job_id": job_id, "status": "failed", "error": str(e)})
         await manager.send_log(job_id, "System", f"Error: {str(e)}", "failed")
+        await manager.send_job_status(job_id, "failed", error=str(e))
 
 # Code generation functions
+@functools.lru_cache(maxsize=256)
 def generate_backend_code(prompt):
     """Generate backend code based on the prompt"""
     
@@ -2457,6 +3013,7 @@ API_URL=http://localhost:8000
 NODE_ENV=development
 DEBUG=true"""
 
+@functools.lru_cache(maxsize=256)
 def generate_readme(prompt):
     return f"""# Generated App
 
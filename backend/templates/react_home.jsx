@@ -0,0 +1,198 @@
+import React, { useState, useEffect, useRef, useReducer } from 'react';
+import { motion } from 'framer-motion';
+
+// Shared, immutable motion props so framer-motion sees stable identities across renders
+const FADE_DOWN = { initial: { opacity: 0, y: -20 }, animate: { opacity: 1, y: 0 } };
+const SCALE_IN = { initial: { opacity: 0, scale: 0.95 }, animate: { opacity: 1, scale: 1 } };
+const BUTTON_PRESS = { whileHover: { scale: 1.05 }, whileTap: { scale: 0.95 } };
+
+// Logs are buffered in a ref and flushed to the screen at most once per LOG_FLUSH_MS
+const LOG_CAP = 5000;
+const LOG_WINDOW = 500;
+const LOG_FLUSH_MS = 60;
+
+const HomePage = () => {
+  const [prompt, setPrompt] = useState('');
+  const [isProcessing, setIsProcessing] = useState(false);
+  const logsRef = useRef([]);
+  const flushTimer = useRef(null);
+  const [, flushLogs] = useReducer((n) => n + 1, 0);
+  const [results, setResults] = useState(null);
+  const [activeTab, setActiveTab] = useState('frontend');
+
+  useEffect(() => () => clearTimeout(flushTimer.current), []);
+
+  const pushLog = (entry) => {
+    logsRef.current.push(entry);
+    if (flushTimer.current !== null) return;
+    flushTimer.current = setTimeout(() => {
+      flushTimer.current = null;
+      const buffer = logsRef.current;
+      if (buffer.length > LOG_CAP) buffer.splice(0, buffer.length - LOG_CAP);
+      requestAnimationFrame(flushLogs);
+    }, LOG_FLUSH_MS);
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    if (!prompt.trim()) return;
+    
+    setIsProcessing(true);
+    logsRef.current = [];
+    flushLogs();
+    setResults(null);
+    
+    try {
+      // Start the job
+      const response = await fetch('/api/generate', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ prompt })
+      });
+      
+      const data = await response.json();
+      const jobId = data.job_id;
+      
+      // Connect to WebSocket for real-time logs
+      const ws = new WebSocket(`ws://localhost:8000/ws/${jobId}`);
+      
+      ws.onmessage = (event) => {
+        const logData = JSON.parse(event.data);
+        
+        // The backend pushes a terminal job_status event on this socket
+        if (logData.type === 'job_status') {
+          setIsProcessing(false);
+          ws.close();
+          if (logData.status === 'completed') {
+            setResults(logData.results);
+          } else if (logData.status === 'failed') {
+            alert('Job failed: ' + logData.error);
+          }
+          return;
+        }
+        
+        // The first frame replays the logs so far; log_lines carries several lines at once
+        if (logData.type === 'init' || logData.type === 'log_lines') {
+          (logData.logs || []).forEach(pushLog);
+          return;
+        }
+        
+        // logs_batch is the job's full history, so it replaces what was received
+        if (logData.type === 'logs_batch') {
+          logsRef.current = [];
+          flushLogs();
+          logData.logs.forEach(pushLog);
+          return;
+        }
+        
+        pushLog(logData);
+      };
+      
+    } catch (error) {
+      console.error('Error:', error);
+      setIsProcessing(false);
+    }
+  };
+
+  const logs = logsRef.current.slice(-LOG_WINDOW);
+  const logOffset = logsRef.current.length - logs.length;
+
+  return (
+    <div className="container mx-auto px-4 py-8">
+      <motion.div 
+        {...FADE_DOWN}
+        className="text-center mb-8"
+      >
+        <h1 className="text-5xl font-bold text-white mb-4">
+          🤖 AI Agent App Builder
+        </h1>
+        <p className="text-xl text-gray-300">
+          Transform your ideas into production-ready apps with AI agents
+        </p>
+      </motion.div>
+      
+      {/* Form section */}
+      <motion.div 
+        {...SCALE_IN}
+        className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 mb-8 border border-white border-opacity-20"
+      >
+        <form onSubmit={handleSubmit} className="space-y-4">
+          <div>
+            <label className="block text-white text-lg font-semibold mb-2">
+              Describe your app idea:
+            </label>
+            <textarea
+              value={prompt}
+              onChange={(e) => setPrompt(e.target.value)}
+              placeholder="e.g., I want a movie recommendation app using TMDB API with user ratings and favorites..."
+              className="w-full h-32 p-4 bg-white bg-opacity-10 border border-white border-opacity-20 rounded-xl text-white placeholder-gray-300 focus:outline-none focus:ring-2 focus:ring-blue-400"
+              disabled={isProcessing}
+            />
+          </div>
+          <motion.button
+            {...BUTTON_PRESS}
+            type="submit"
+            disabled={isProcessing || !prompt.trim()}
+            className="w-full bg-gradient-to-r from-blue-500 to-purple-600 text-white font-bold py-4 px-8 rounded-xl disabled:opacity-50 disabled:cursor-not-allowed hover:shadow-lg transition-all duration-300"
+          >
+            {isProcessing ? (
+              <span className="flex items-center justify-center">
+                <div className="animate-spin rounded-full h-6 w-6 border-b-2 border-white mr-3"></div>
+                Agents Working...
+              </span>
+            ) : (
+              '🚀 Launch AI Agents'
+            )}
+          </motion.button>
+        </form>
+      </motion.div>
+      
+      {/* Results section - only shown when results are available */}
+      {(isProcessing || results) && (
+        <div className="grid lg:grid-cols-3 gap-8 mt-8">
+          {/* Agent Status Panel */}
+          <div className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 border border-white border-opacity-20">
+            <h2 className="text-2xl font-bold text-white mb-6 flex items-center">
+              <span className="mr-3">🔄</span>
+              Agent Pipeline
+            </h2>
+            {/* Agent status items would go here */}
+          </div>
+          
+          {/* Agent Logs */}
+          <div className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 border border-white border-opacity-20">
+            <h2 className="text-2xl font-bold text-white mb-6 flex items-center">
+              <span className="mr-3">📊</span>
+              Agent Console
+            </h2>
+            <div className="bg-black bg-opacity-50 rounded-lg p-4 h-80 overflow-y-auto font-mono">
+              {logs.length === 0 ? (
+                <div className="text-gray-400 text-center py-8">
+                  Agent logs will appear here...
+                </div>
+              ) : (
+                logs.map((log, index) => (
+                  <div key={logOffset + index} className="mb-2 text-sm">
+                    <span className="text-gray-500">[{log.timestamp}]</span>
+                    <span className={`${log.status === 'completed' ? 'text-green-400' : 'text-blue-400'}`}> {log.message}</span>
+                  </div>
+                ))
+              )}
+            </div>
+          </div>
+          
+          {/* Code Preview Panel */}
+          <div className="bg-white bg-opacity-10 backdrop-filter backdrop-blur-lg rounded-2xl p-6 border border-white border-opacity-20">
+            <h2 className="text-2xl font-bold text-white mb-6 flex items-center">
+              <span className="mr-3">💻</span>
+              Code Preview
+            </h2>
+            {/* Code preview tabs and content would go here */}
+          </div>
+        </div>
+      )}
+    </div>
+  );
+};
+
+export default HomePage;
@@ -405,9 +405,33 @@ const HomePage = () => {
         const data = JSON.parse(event.data);
         console.log('WebSocket message received:', data); // Add debug logging
         
+        // The first frame carries the current progress and the logs so far
+        if (data.type === 'init') {
+          const initLogs = data.logs || [];
+          setLogs(prevLogs => [...prevLogs, ...initLogs]);
+          if (data.progress) {
+            handleMessage({ type: 'progress_update', progress: data.progress });
+          }
+          initLogs.forEach(handleMessage);
+          return;
+        }
+        
+        // Several log lines sent together, with the progress after all of them
+        if (data.type === 'log_lines') {
+          setLogs(prevLogs => [...prevLogs, ...data.logs]);
+          data.logs.forEach(handleMessage);
+          if (data.progress_update) {
+            handleMessage({ type: 'progress_update', progress: data.progress_update });
+          }
+          return;
+        }
+        
         // Add to logs
         setLogs(prevLogs => [...prevLogs, data]);
-        
+        handleMessage(data);
+      };
+      
+      const handleMessage = (data) => {
         // Add to terminal output with proper formatting
         if (data.message) {
           setTerminalOutput(prev => [
@@ -485,14 +509,16 @@ const HomePage = () => {
           }
         }
         
-        // If we receive progress information directly, use it
-        if (data.type === 'progress_update' && data.progress) {
+        // If we receive progress information directly, use it. Log frames carry
+        // it as progress_update whenever it changed
+        const progressMap = data.type === 'progress_update' ? data.progress : data.progress_update;
+        if (progressMap) {
           // Update agent progress directly from backend data
           setAgentStatuses(prev => {
             const newStatuses = {...prev};
             
             // Update status for each agent based on progress
-            Object.entries(data.progress).forEach(([agent, progress]) => {
+            Object.entries(progressMap).forEach(([agent, progress]) => {
               if (progress >= 100) {
                 newStatuses[agent] = 'completed';
               } else if (progress > 0) {
@@ -513,7 +539,7 @@ const HomePage = () => {
           };
           
           let totalProgress = 0;
-          Object.entries(data.progress).forEach(([agent, progress]) => {
+          Object.entries(progressMap).forEach(([agent, progress]) => {
             totalProgress += progress * weights[agent];
           });
           